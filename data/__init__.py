@@ -1 +1,6 @@
-from .data_fetcher import DataFetcher
+from .data_fetcher import DataFetcher, get_shared_fetcher
+from .market_cache import MarketDataCache
+from .backends import MarketDataBackend, YFinanceBackend, LocalFileBackend
+from .scheduler import FetchScheduler, FetchMetrics, TokenBucket
+from .streaming import RollingReturnStream
+from .quotes import QuoteService, get_quote_service, HOME_INDICES
@@ -0,0 +1,287 @@
+"""
+시장 데이터 백엔드 모듈 (yfinance/FRED 온라인, 로컬 파일 오프라인)
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import yfinance as yf
+
+from .market_cache import is_intraday, slice_period
+
+
+class MarketDataBackend(ABC):
+    """
+    시장 데이터 백엔드 인터페이스
+
+    DataFetcher 는 이 인터페이스를 통해서만 원천 데이터를 조회합니다.
+    오류는 예외로 전달하며, 빈 결과 처리는 DataFetcher 가 담당합니다.
+    """
+
+    # 조회 결과를 DataFetcher 의 디스크 캐시에 저장할지 여부
+    cacheable = True
+
+    # 초당 최대 요청 수 (None 이면 제한 없음)
+    rate_limit = None
+
+    @property
+    def has_fred(self):
+        """FRED 시계열 조회 가능 여부"""
+        return False
+
+    @abstractmethod
+    def history(self, ticker, interval="1d", period=None, start=None):
+        """OHLCV 이력 조회 (period 또는 start 지정)"""
+
+    def download(self, tickers, interval="1d", period=None, start=None):
+        """
+        여러 종목 일괄 조회
+
+        Returns:
+        --------
+        dict
+            티커별 DataFrame (조회되지 않은 종목은 제외)
+        """
+        result = {}
+        for ticker in tickers:
+            try:
+                data = self.history(ticker, interval=interval, period=period, start=start)
+            except Exception as e:
+                print(f"데이터 조회 오류 ({ticker}): {e}")
+                continue
+            if not data.empty:
+                result[ticker] = data
+        return result
+
+    @abstractmethod
+    def info(self, ticker):
+        """종목 기본 정보 조회"""
+
+    @abstractmethod
+    def option_expirations(self, ticker):
+        """옵션 만기일 목록 조회"""
+
+    @abstractmethod
+    def option_chain(self, ticker, expiration):
+        """특정 만기의 옵션 체인 조회 (calls, puts)"""
+
+    @abstractmethod
+    def fred_series(self, series_id, observation_start=None):
+        """FRED 시계열 조회"""
+
+
+class YFinanceBackend(MarketDataBackend):
+    """yfinance + FRED 온라인 백엔드"""
+
+    rate_limit = 5.0
+
+    def __init__(self, fred_api_key=None):
+        self.fred = None
+
+        # FRED API 초기화 (키가 있는 경우)
+        if fred_api_key:
+            try:
+                from fredapi import Fred
+                self.fred = Fred(api_key=fred_api_key)
+            except:
+                print("Warning: FRED API 초기화 실패. 수익률 곡선 기능이 제한됩니다.")
+
+    @property
+    def has_fred(self):
+        return self.fred is not None
+
+    def history(self, ticker, interval="1d", period=None, start=None):
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(interval=interval, start=start)
+        return stock.history(interval=interval, period=period)
+
+    def download(self, tickers, interval="1d", period=None, start=None):
+        """
+        yf.download 일괄 조회 후 종목별 DataFrame으로 분리
+
+        일별 이상 봉에서 자정 기준이 아닌 종목(거래소 시간대가 다른 종목)은
+        날짜가 어긋날 수 있으므로 결과에서 제외하여 개별 조회로 넘깁니다.
+        """
+        kwargs = {'start': start} if start is not None else {'period': period}
+        data = yf.download(
+            tickers, interval=interval, group_by='ticker', actions=True,
+            auto_adjust=True, ignore_tz=False, threads=False, progress=False, **kwargs
+        )
+
+        if data is None or data.empty:
+            return {}
+
+        result = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                frame = data[ticker]
+            elif len(tickers) == 1:
+                frame = data
+            else:
+                continue
+
+            frame = frame.dropna(how='all')
+            frame.columns.name = None
+            if frame.empty:
+                continue
+            if not is_intraday(interval) and (frame.index != frame.index.normalize()).any():
+                continue
+            result[ticker] = frame
+
+        return result
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def option_expirations(self, ticker):
+        return list(yf.Ticker(ticker).options)
+
+    def option_chain(self, ticker, expiration):
+        opt = yf.Ticker(ticker).option_chain(expiration)
+        return opt.calls, opt.puts
+
+    def fred_series(self, series_id, observation_start=None):
+        if self.fred is None:
+            raise RuntimeError("FRED API 키가 설정되지 않았습니다.")
+        return self.fred.get_series(series_id, observation_start=observation_start)
+
+
+class LocalFileBackend(MarketDataBackend):
+    """
+    로컬 파일(Parquet/CSV) 오프라인 백엔드
+
+    네트워크 없이 동일한 결과를 재현하기 위한 고정 데이터(fixture) 백엔드입니다.
+    파일은 메모리 매핑으로 읽으며, 기간('1y', '5d' 등)은 현재 시각이 아니라
+    각 파일의 마지막 봉을 기준으로 잘라 항상 같은 결과를 반환합니다.
+
+    디렉터리 구조::
+
+        root/
+        ├── ohlcv/<interval>/<TICKER>.parquet|csv       # 인덱스: Date 또는 Datetime
+        ├── info/<TICKER>.json                           # exchangeTimezoneName 이 있으면 시간대 적용
+        ├── options/<TICKER>/<YYYY-MM-DD>_calls.parquet|csv
+        ├── options/<TICKER>/<YYYY-MM-DD>_puts.parquet|csv
+        └── fred/<SERIES_ID>.parquet|csv                 # 컬럼: date, value
+    """
+
+    cacheable = False
+
+    def __init__(self, root):
+        self.root = root
+        self._frames = {}
+
+    @property
+    def has_fred(self):
+        return os.path.isdir(os.path.join(self.root, 'fred'))
+
+    def _find(self, *parts):
+        """parquet 우선, 없으면 csv 경로 반환"""
+        base = os.path.join(self.root, *parts)
+        for ext in ('.parquet', '.csv'):
+            if os.path.exists(base + ext):
+                return base + ext
+        raise FileNotFoundError(f"데이터 파일이 없습니다: {base}.parquet|csv")
+
+    def _read(self, path, index_col=None):
+        """메모리 매핑으로 파일 읽기 (경로별 최신 수정 시각의 결과만 재사용)"""
+        mtime = os.path.getmtime(path)
+        cached = self._frames.get(path)
+        if cached is None or cached[0] != mtime:
+            if path.endswith('.parquet'):
+                frame = pd.read_parquet(path, memory_map=True)
+            else:
+                frame = pd.read_csv(path, memory_map=True, index_col=index_col)
+            cached = (mtime, frame)
+            self._frames[path] = cached
+        return cached[1]
+
+    def history(self, ticker, interval="1d", period=None, start=None):
+        data = self._read(self._find('ohlcv', interval, ticker), index_col=0)
+
+        # 파일 형식과 관계없이 같은 인덱스가 되도록 모든 데이터에 시간대 적용
+        index = data.index if isinstance(data.index, pd.DatetimeIndex) else _parse_index(data.index)
+        tz = self._timezone(ticker)
+        if tz:
+            # 날짜만 있는 행(naive)은 거래소 현지 날짜로, 오프셋이 있는 행은 시각 변환
+            if index.tz is None:
+                index = index.tz_localize(tz)
+            else:
+                index = index.tz_convert(tz)
+        data = data.set_axis(index.rename('Datetime' if is_intraday(interval) else 'Date')).sort_index()
+
+        if start is not None:
+            start = pd.Timestamp(start)
+            if data.index.tz is not None and start.tzinfo is None:
+                start = start.tz_localize(data.index.tz)
+            return data[data.index >= start]
+        if data.empty:
+            return data
+
+        now = data.index[-1]
+        return slice_period(data, period or '1mo', now=now if now.tzinfo else now.tz_localize('UTC'))
+
+    def _timezone(self, ticker):
+        try:
+            return self.info(ticker).get('exchangeTimezoneName')
+        except FileNotFoundError:
+            return None
+
+    def info(self, ticker):
+        with open(os.path.join(self.root, 'info', f'{ticker}.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def option_expirations(self, ticker):
+        directory = os.path.join(self.root, 'options', ticker)
+        if not os.path.isdir(directory):
+            return []
+        names = {name.split('_')[0] for name in os.listdir(directory) if '_' in name}
+        return sorted(names)
+
+    def option_chain(self, ticker, expiration):
+        calls = self._read(self._find('options', ticker, f'{expiration}_calls'))
+        puts = self._read(self._find('options', ticker, f'{expiration}_puts'))
+        return calls, puts
+
+    def fred_series(self, series_id, observation_start=None):
+        frame = self._read(self._find('fred', series_id))
+        series = pd.Series(
+            frame['value'].to_numpy(dtype=float),
+            index=pd.DatetimeIndex(pd.to_datetime(frame['date'])),
+            name=series_id
+        )
+        if observation_start is not None:
+            series = series[series.index >= pd.Timestamp(observation_start)]
+        return series
+
+
+def _parse_index(index):
+    """
+    CSV 날짜 인덱스 파싱 (날짜만 있거나 naive 시각이면 naive 로 유지)
+
+    서머타임 전후처럼 UTC 오프셋이 섞인 시각만 UTC 로 통일합니다.
+    """
+    try:
+        parsed = pd.to_datetime(index)
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, pd.DatetimeIndex):
+        parsed = pd.to_datetime(index, utc=True)
+    return parsed
+
+
+def default_backend(fred_api_key=None):
+    """
+    환경 변수에 따른 기본 백엔드
+
+    FM_DASH_DATA_DIR 가 설정되어 있으면 해당 디렉터리의 로컬 파일 백엔드를,
+    아니면 yfinance + FRED 백엔드를 사용합니다.
+    """
+    data_dir = os.environ.get('FM_DASH_DATA_DIR')
+    if data_dir:
+        return LocalFileBackend(data_dir)
+    return YFinanceBackend(fred_api_key)
@@ -2,110 +2,628 @@
 고급 데이터 수집 모듈 (Yahoo Finance + FRED)
 """
 
-import yfinance as yf
+import os
+import threading
+import time
+import warnings
+
 import pandas as pd
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from .backends import default_backend
+from .market_cache import MarketDataCache, FULL_HISTORY_TS, is_intraday, is_session_period, period_start, slice_period
+from .scheduler import FetchScheduler
+from .streaming import RollingReturnStream
+
+# FRED 시리즈 ID (미국 국채 수익률)
+TREASURY_SERIES = {
+    '1M': 'DGS1MO',
+    '3M': 'DGS3MO',
+    '6M': 'DGS6MO',
+    '1Y': 'DGS1',
+    '2Y': 'DGS2',
+    '3Y': 'DGS3',
+    '5Y': 'DGS5',
+    '7Y': 'DGS7',
+    '10Y': 'DGS10',
+    '20Y': 'DGS20',
+    '30Y': 'DGS30'
+}
+
+# FRED API 키가 없을 때 사용하는 샘플 수익률 곡선 (%)
+SAMPLE_TREASURY_YIELDS = {
+    '1M': 5.0, '3M': 5.2, '6M': 5.3, '1Y': 4.8,
+    '2Y': 4.5, '3Y': 4.3, '5Y': 4.2, '7Y': 4.3,
+    '10Y': 4.4, '20Y': 4.6, '30Y': 4.5
+}
+
+# 옵션 곡면 테이블 컬럼
+OPTION_SURFACE_COLUMNS = [
+    'expiry', 'type', 'strike', 'bid', 'ask', 'lastPrice',
+    'impliedVolatility', 'openInterest', 'volume'
+]
+
+# 메모리 캐시 유효 시간 (초)
+DEFAULT_TTL = {
+    'history': 60,
+    'info': 3600,
+    'options': 60,
+    'yields': 900
+}
+
+
 class DataFetcher:
     """yfinance + FRED를 사용한 시장 데이터 수집 클래스"""
 
-    def __init__(self, fred_api_key=None):
-        self.cache = {}
+    def __init__(self, fred_api_key=None, cache_path=None, use_cache=True, backend=None, ttl=None,
+                 scheduler=None):
+        """
+        Parameters:
+        -----------
+        fred_api_key : str, optional
+            FRED API 키 (없으면 환경 변수 FRED_API_KEY 사용)
+        cache_path : str, optional
+            디스크 캐시(SQLite) 경로
+        use_cache : bool
+            디스크 캐시 사용 여부 (로컬 파일 백엔드는 항상 미사용)
+        backend : MarketDataBackend, optional
+            원천 데이터 백엔드 (기본값은 환경 변수에 따라 yfinance 또는 로컬 파일)
+        ttl : dict, optional
+            조회 종류별 메모리 캐시 유효 시간 (초), DEFAULT_TTL 을 덮어씀
+        scheduler : FetchScheduler, optional
+            원천 요청 실행기 (기본값은 백엔드의 rate_limit 을 적용한 재시도 스케줄러)
+        """
+        fred_api_key = fred_api_key or os.environ.get('FRED_API_KEY')
         self.fred_api_key = fred_api_key
+        self.backend = backend if backend is not None else default_backend(fred_api_key)
+        self.scheduler = scheduler if scheduler is not None else FetchScheduler(rate=self.backend.rate_limit)
 
-        # FRED API 초기화 (키가 있는 경우)
-        if fred_api_key:
+        # OHLCV 영구 캐시 (SQLite)
+        self.cache = None
+        if use_cache and self.backend.cacheable:
             try:
-                from fredapi import Fred
-                self.fred = Fred(api_key=fred_api_key)
-            except:
-                self.fred = None
-                print("Warning: FRED API 초기화 실패. 수익률 곡선 기능이 제한됩니다.")
+                self.cache = MarketDataCache(cache_path)
+            except Exception as e:
+                print(f"Warning: 데이터 캐시 초기화 실패 ({e}). 캐시 없이 조회합니다.")
+
+        # 메모리 캐시 + 진행 중 요청 (동일 요청은 한 번만 조회)
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self._memo = {}
+        self._inflight = {}
+        self._memo_lock = threading.Lock()
+
+    def _claim(self, key):
+        """
+        메모리 캐시 조회 또는 진행 중인 동일 요청에 합류
+
+        Returns:
+        --------
+        tuple
+            ('hit', 값), ('wait', 진행 중 Future), ('own', 새 Future) 중 하나
+        """
+        with self._memo_lock:
+            entry = self._memo.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.metrics.record_cache_hit(key[0])
+                return 'hit', entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                return 'wait', future
+
+            future = Future()
+            self._inflight[key] = future
+            return 'own', future
+
+    def _release(self, key, future, value=None, error=None, cacheable=True):
+        """조회 결과를 대기 중인 요청에 전달하고 메모리 캐시에 저장 (빈 결과는 저장하지 않음)"""
+        with self._memo_lock:
+            self._inflight.pop(key, None)
+            ttl = self.ttl.get(key[0], 0)
+            if error is None and ttl > 0 and cacheable and not _is_empty(value):
+                self._memo[key] = (time.monotonic() + ttl, value)
+
+        if error is not None:
+            future.set_exception(error)
         else:
-            self.fred = None
+            future.set_result(value)
+
+    def _single_flight(self, key, loader, cacheable=None):
+        """
+        동일 key 의 동시 요청은 한 번만 조회하고 결과를 공유
+
+        cacheable(value) 가 False 이면 (일부 조회 실패 등) 결과를 공유만 하고
+        메모리 캐시에는 저장하지 않습니다.
+        """
+        state, obj = self._claim(key)
+        if state == 'hit':
+            return obj
+        if state == 'wait':
+            return obj.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            self._release(key, obj, error=e)
+            raise
+        self._release(key, obj, value=value, cacheable=cacheable is None or cacheable(value))
+        return value
+
+    @property
+    def metrics(self):
+        """요청 지표 (FetchMetrics), snapshot() 으로 조회"""
+        return self.scheduler.metrics
+
+    def clear_memory_cache(self):
+        """메모리 캐시 비우기 (디스크 캐시는 유지)"""
+        with self._memo_lock:
+            self._memo.clear()
 
     def get_stock_data(self, ticker, period="1y", interval="1d"):
-        """주식 데이터 조회"""
+        """
+        주식 데이터 조회
+
+        캐시가 있으면 디스크에 저장된 이력을 사용하고, 마지막 저장 시점 이후의
+        봉만 새로 조회하여 병합합니다. 수정주가 기준이 바뀐 경우(분할/배당)에는
+        해당 종목 캐시를 비우고 전체 기간을 다시 조회합니다. 반환된 DataFrame 은
+        다른 요청과 공유되므로 수정하지 말고 복사해서 사용해야 합니다.
+        """
+        return self._single_flight(
+            ('history', ticker, period, interval),
+            lambda: self._get_stock_data(ticker, period, interval)
+        )
+
+    def _get_stock_data(self, ticker, period, interval):
+        if self.cache is None:
+            return _or_empty(self._fetch_history(ticker, period=period, interval=interval))
+
+        start = period_start(period)
+        plan = self._plan_history_fetch(ticker, period, interval, start)
+        if plan is not None:
+            data = self._fetch_history(ticker, interval=interval, **plan)
+            self._store_history(ticker, period, interval, start, plan, data)
+
+        return self._load_cached_history(ticker, period, interval, start)
+
+    def _fetch_history(self, ticker, interval="1d", **kwargs):
+        """
+        백엔드 history 조회 (period 또는 start 지정)
+
+        Returns:
+        --------
+        pd.DataFrame or None
+            조회 결과 (조회에 실패하면 None, 신규 봉이 없는 것과 구분)
+        """
         try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period, interval=interval)
-            return data
+            return self.scheduler.call('history', self.backend.history, ticker, interval=interval, **kwargs)
         except Exception as e:
-            print(f"데이터 조회 오류: {e}")
-            return pd.DataFrame()
+            warnings.warn(f"{ticker} 데이터 조회 오류: {e}", RuntimeWarning, stacklevel=2)
+            return None
+
+    def _plan_history_fetch(self, ticker, period, interval, start, max_age=None):
+        """
+        캐시 상태에 따른 조회 계획
+
+        Returns:
+        --------
+        dict or None
+            history() 인자 ({'period': ...} 전체 조회, {'start': ...} 증분 조회),
+            캐시가 충분히 최신이면 None
+        """
+        meta = self.cache.get_meta(ticker, interval)
+
+        if not self.cache.covers(meta, start):
+            return {'period': period}
+        if self.cache.is_fresh(meta, max_age):
+            self.metrics.record_cache_hit('history')
+            return None
+
+        # 완성된 직전 봉부터 다시 조회 (마지막 봉은 장중 미완성일 수 있음)
+        # 직전 봉은 저장된 값과 비교하여 수정주가 기준 변경을 확인하는 데 사용
+        prev = pd.Timestamp(meta['prev_ts'], unit='ns', tz='UTC')
+        if meta['tz']:
+            prev = prev.tz_convert(meta['tz'])
+        return {'start': prev.to_pydatetime()}
+
+    def _store_history(self, ticker, period, interval, start, plan, data):
+        """
+        조회 결과를 캐시에 병합 (수정주가 기준이 바뀌었으면 전체 재조회)
+
+        조회에 실패하면 (data 가 None) 갱신 시각을 기록하지 않아 다음 요청에서 다시
+        조회합니다. 증분 조회가 정상적으로 빈 결과를 돌려준 경우에만 갱신 시각을 기록합니다.
+        """
+        if data is None:
+            return
+        if data.empty:
+            if 'start' in plan:
+                self.cache.touch(ticker, interval)
+            return
+
+        if 'start' in plan and self._adjustment_changed(ticker, interval, data):
+            print(f"Warning: {ticker} 수정주가 기준이 변경되어 캐시를 비우고 전체 기간을 다시 조회합니다.")
+            self.cache.clear(ticker)
+            plan = {'period': period}
+            data = self._fetch_history(ticker, interval=interval, **plan)
+            if data is None or data.empty:
+                return
+
+        if 'period' in plan:
+            covers_from = FULL_HISTORY_TS if start is None else start
+        else:
+            covers_from = None
+        self.cache.store_ohlcv(ticker, interval, data, covers_from=covers_from)
+
+    def _adjustment_changed(self, ticker, interval, data, rtol=1e-4):
+        """
+        증분 조회 결과가 캐시와 다른 수정주가 기준인지 여부
+
+        yfinance 는 분할/배당을 과거 가격 전체에 소급 반영하므로, 새 봉에 분할/배당이
+        있거나 다시 받은 완성 봉의 종가가 저장된 값과 다르면 캐시된 이력과 이어 붙일 수
+        없습니다. 마지막 저장 봉은 장중 미완성일 수 있어 종가 비교에서 제외합니다.
+        """
+        cached = self.cache.load_ohlcv(ticker, interval, start=data.index.min())
+        if cached.empty:
+            return False
+
+        overlap = cached.index.intersection(data.index)
+        overlap = overlap[overlap < cached.index[-1]]
+        if len(overlap) and not np.allclose(
+            data.loc[overlap, 'Close'].to_numpy(dtype=float),
+            cached.loc[overlap, 'Close'].to_numpy(dtype=float),
+            rtol=rtol, equal_nan=True
+        ):
+            return True
+
+        # 캐시에 이미 반영된 분할/배당(같은 봉, 같은 값)은 제외
+        for col in ('Dividends', 'Stock Splits'):
+            if col not in data.columns:
+                continue
+            actions = data[col].fillna(0.0)
+            known = cached[col].reindex(data.index).fillna(0.0) if col in cached.columns else 0.0
+            if ((actions != 0) & (actions != known)).any():
+                return True
+        return False
+
+    def _load_cached_history(self, ticker, period, interval, start):
+        """캐시에서 요청 기간만큼 잘라서 반환"""
+        # 'Nd' 기간은 최근 N개 거래일 기준 (주말/휴일 여유분 포함 조회)
+        if is_session_period(period):
+            n_days = int(period[:-1])
+            data = self.cache.load_ohlcv(ticker, interval, start=start - timedelta(days=2 * n_days + 7))
+            return slice_period(data, period)
+
+        return self.cache.load_ohlcv(ticker, interval, start=start)
+
+    def get_multiple_stocks(self, tickers, period="1y", interval="1d", batch_size=20, max_workers=8,
+                            max_age=None):
+        """
+        여러 주식 데이터 동시 조회
+
+        조회가 필요한 종목을 같은 조건(전체/증분)끼리 묶어 백엔드 일괄 요청으로
+        가져오고, 일괄 요청에서 누락된 종목은 스레드 풀에서 개별 조회합니다.
+
+        Parameters:
+        -----------
+        tickers : list of str
+            종목 티커 목록
+        batch_size : int
+            일괄 요청 1회당 최대 종목 수 (1 이하이면 일괄 요청 없이 개별 조회)
+        max_workers : int
+            동시 요청 수 상한
+        max_age : float, optional
+            디스크 캐시를 재조회 없이 사용할 최대 경과 시간 (초, 기본값은 캐시 설정)
 
-    def get_multiple_stocks(self, tickers, period="1y", interval="1d"):
-        """여러 주식 데이터 동시 조회"""
-        data_dict = {}
+        Returns:
+        --------
+        dict
+            티커별 OHLCV DataFrame (입력 순서 유지)
+        """
+        tickers = list(dict.fromkeys(tickers))
+
+        # 메모리 캐시/진행 중 요청은 재사용하고 나머지만 직접 조회
+        result, waiting, owned = {}, {}, {}
+        for ticker in tickers:
+            state, obj = self._claim(('history', ticker, period, interval))
+            if state == 'hit':
+                result[ticker] = obj
+            elif state == 'wait':
+                waiting[ticker] = obj
+            else:
+                owned[ticker] = obj
+
+        if owned:
+            try:
+                loaded = self._get_multiple_stocks(list(owned), period, interval, batch_size, max_workers, max_age)
+            except BaseException as e:
+                for ticker, future in owned.items():
+                    self._release(('history', ticker, period, interval), future, error=e)
+                raise
+            for ticker, future in owned.items():
+                self._release(('history', ticker, period, interval), future, value=loaded[ticker])
+            result.update(loaded)
+
+        for ticker, future in waiting.items():
+            result[ticker] = future.result()
+
+        return {ticker: result[ticker] for ticker in tickers}
+
+    def _get_multiple_stocks(self, tickers, period, interval, batch_size, max_workers, max_age):
+        start = period_start(period)
+
+        # 조회 계획 수립 (캐시가 최신인 종목은 제외)
+        plans = {}
         for ticker in tickers:
-            data_dict[ticker] = self.get_stock_data(ticker, period, interval)
-        return data_dict
+            if self.cache is None:
+                plans[ticker] = {'period': period}
+            else:
+                plan = self._plan_history_fetch(ticker, period, interval, start, max_age)
+                if plan is not None:
+                    plans[ticker] = plan
+
+        fetched = {}
+        if plans:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                if batch_size > 1:
+                    futures = [
+                        pool.submit(self._download_batch, batch, interval, plan)
+                        for batch, plan in self._group_batches(plans, batch_size)
+                    ]
+                    for future in futures:
+                        fetched.update(future.result())
+
+                # 일괄 요청에서 누락된 종목은 개별 조회
+                missing = [t for t in plans if fetched.get(t) is None or fetched[t].empty]
+                futures = {
+                    t: pool.submit(self._fetch_history, t, interval=interval, **plans[t])
+                    for t in missing
+                }
+                for ticker, future in futures.items():
+                    fetched[ticker] = future.result()
+
+        if self.cache is None:
+            return {ticker: _or_empty(fetched[ticker]) for ticker in tickers}
+
+        for ticker, plan in plans.items():
+            self._store_history(ticker, period, interval, start, plan, fetched[ticker])
+        return {ticker: self._load_cached_history(ticker, period, interval, start) for ticker in tickers}
+
+    def _group_batches(self, plans, batch_size):
+        """
+        조회 계획이 같은 종목끼리 batch_size 단위로 묶음
+
+        증분 조회는 거래소 시간대별로 묶고 그룹 내 가장 이른 시점부터 조회합니다.
+        """
+        full = {}
+        incremental = {}
+        for ticker, plan in plans.items():
+            if 'period' in plan:
+                full.setdefault(plan['period'], []).append(ticker)
+            else:
+                incremental.setdefault(str(plan['start'].tzinfo), []).append(ticker)
+
+        groups = [(group, {'period': p}) for p, group in full.items()]
+        for group in incremental.values():
+            earliest = min(plans[t]['start'] for t in group)
+            groups.append((group, {'start': earliest}))
+
+        for group, plan in groups:
+            for i in range(0, len(group), batch_size):
+                yield group[i:i + batch_size], plan
+
+    def _download_batch(self, tickers, interval, plan):
+        """백엔드 일괄 조회 (실패 시 빈 결과로 개별 조회에 넘김)"""
+        try:
+            return self.scheduler.call('download', self.backend.download, tickers, interval=interval, **plan)
+        except Exception as e:
+            print(f"일괄 데이터 조회 오류: {e}")
+            return {}
 
     def get_stock_info(self, ticker):
         """주식 기본 정보 조회"""
+        return self._single_flight(('info', ticker), lambda: self._get_stock_info(ticker))
+
+    def _get_stock_info(self, ticker):
         try:
-            stock = yf.Ticker(ticker)
-            return stock.info
+            return self.scheduler.call('info', self.backend.info, ticker)
         except Exception as e:
             print(f"정보 조회 오류: {e}")
             return {}
 
     def get_options_chain(self, ticker):
         """옵션 체인 데이터 조회"""
+        return self._single_flight(('options', ticker), lambda: self._get_options_chain(ticker))
+
+    def _get_options_chain(self, ticker):
         try:
-            stock = yf.Ticker(ticker)
-            expirations = stock.options
+            expirations = self.scheduler.call('options', self.backend.option_expirations, ticker)
             if len(expirations) > 0:
-                opt = stock.option_chain(expirations[0])
-                return opt.calls, opt.puts
+                return self.scheduler.call('options', self.backend.option_chain, ticker, expirations[0])
             return pd.DataFrame(), pd.DataFrame()
         except Exception as e:
             print(f"옵션 데이터 조회 오류: {e}")
             return pd.DataFrame(), pd.DataFrame()
 
-    def get_treasury_yields(self):
+    def get_option_surface(self, ticker, max_workers=8):
         """
-        미국 국채 수익률 곡선 데이터 조회 (FRED)
+        전체 만기 옵션 체인 조회 (변동성 곡면용)
+
+        모든 만기의 체인을 동시에 조회하여 하나의 컬럼형 테이블로 합칩니다.
+        결과는 'options' TTL 동안 메모리에 캐시됩니다.
+
+        Parameters:
+        -----------
+        ticker : str
+            기초자산 티커
+        max_workers : int
+            동시 요청 수 상한
 
         Returns:
         --------
         pd.DataFrame
-            기간별 수익률 데이터
-        """
-        # FRED 시리즈 ID (미국 국채 수익률)
-        yield_series = {
-            '1M': 'DGS1MO',
-            '3M': 'DGS3MO',
-            '6M': 'DGS6MO',
-            '1Y': 'DGS1',
-            '2Y': 'DGS2',
-            '3Y': 'DGS3',
-            '5Y': 'DGS5',
-            '7Y': 'DGS7',
-            '10Y': 'DGS10',
-            '20Y': 'DGS20',
-            '30Y': 'DGS30'
-        }
-
-        if self.fred:
-            try:
-                yields = {}
-                for maturity, series_id in yield_series.items():
-                    data = self.fred.get_series(series_id, observation_start='2020-01-01')
-                    yields[maturity] = data.iloc[-1] if not data.empty else np.nan
+            expiry, type('call'/'put'), strike, bid, ask, lastPrice,
+            impliedVolatility, openInterest, volume 컬럼 (만기/유형/행사가 순 정렬)
+        """
+        return self._single_flight(
+            ('options', 'surface', ticker),
+            lambda: self._get_option_surface(ticker, max_workers)
+        )
 
-                return pd.Series(yields)
+    def _get_option_surface(self, ticker, max_workers):
+        try:
+            expirations = self.scheduler.call('options', self.backend.option_expirations, ticker)
+        except Exception as e:
+            print(f"옵션 데이터 조회 오류: {e}")
+            return pd.DataFrame(columns=OPTION_SURFACE_COLUMNS)
+
+        def load(expiration):
+            try:
+                return self.scheduler.call('options', self.backend.option_chain, ticker, expiration)
             except Exception as e:
-                print(f"FRED 데이터 조회 오류: {e}")
+                print(f"옵션 데이터 조회 오류 ({expiration}): {e}")
+                return pd.DataFrame(), pd.DataFrame()
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            chains = list(pool.map(load, expirations))
+
+        frames = []
+        for expiration, (calls, puts) in zip(expirations, chains):
+            for option_type, chain in (('call', calls), ('put', puts)):
+                if chain.empty:
+                    continue
+                frame = chain.reindex(columns=OPTION_SURFACE_COLUMNS[2:])
+                frame.insert(0, 'type', option_type)
+                frame.insert(0, 'expiry', pd.Timestamp(expiration))
+                frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=OPTION_SURFACE_COLUMNS)
+
+        surface = pd.concat(frames, ignore_index=True)
+        surface['type'] = pd.Categorical(surface['type'], categories=['call', 'put'])
+        surface['strike'] = surface['strike'].astype('float64')
+        for col in ['bid', 'ask', 'lastPrice', 'impliedVolatility']:
+            surface[col] = surface[col].astype('float32')
+        for col in ['openInterest', 'volume']:
+            surface[col] = surface[col].fillna(0).astype('int32')
+
+        return surface.sort_values(['expiry', 'type', 'strike'], ignore_index=True)
+
+    def get_treasury_yields(self):
+        """
+        미국 국채 수익률 곡선 데이터 조회 (FRED)
+
+        만기마다 마지막 유효 관측값을 사용하고, 조회에 실패하여 관측값이 없는 만기는
+        NaN 으로 남깁니다 (이 경우 메모리 캐시에 저장하지 않아 다음 요청에서 다시 조회).
+
+        Returns:
+        --------
+        pd.Series
+            기간별 최신 수익률 (%)
+        """
+        return self._single_flight(
+            ('yields', 'latest'), self._get_treasury_yields,
+            cacheable=lambda curve: not curve.isna().any()
+        )
+
+    def _get_treasury_yields(self):
+        if self.backend.has_fred:
+            history = self.get_treasury_yield_history()
+            if not history.empty:
+                # 휴일 등으로 비어 있는 만기는 만기별 직전 관측값 사용
+                curve = history.ffill().iloc[-1].rename(None)
+                missing = curve.index[curve.isna()]
+                if len(missing):
+                    print(f"Warning: {', '.join(missing)} 수익률을 조회하지 못했습니다.")
+                return curve
 
         # FRED API가 없는 경우 샘플 데이터 반환
         print("Warning: FRED API 키가 없어 샘플 수익률 곡선을 사용합니다.")
-        return pd.Series({
-            '1M': 5.0, '3M': 5.2, '6M': 5.3, '1Y': 4.8,
-            '2Y': 4.5, '3Y': 4.3, '5Y': 4.2, '7Y': 4.3,
-            '10Y': 4.4, '20Y': 4.6, '30Y': 4.5
-        })
+        return pd.Series(SAMPLE_TREASURY_YIELDS)
+
+    def get_treasury_yield_history(self, start=None, max_workers=len(TREASURY_SERIES)):
+        """
+        미국 국채 수익률 곡선 이력 조회 (FRED)
+
+        만기별 시리즈를 동시에 조회하며, 캐시가 있으면 마지막 저장일 이후의
+        관측값만 새로 받아 디스크의 전체 이력과 병합합니다. 관측값이 하나도 없는
+        만기가 있으면 (조회 실패) 결과를 메모리 캐시에 저장하지 않습니다.
+
+        Parameters:
+        -----------
+        start : str or pd.Timestamp, optional
+            반환할 이력의 시작일 (None 이면 전체 이력)
+        max_workers : int
+            동시 요청 수 상한
+
+        Returns:
+        --------
+        pd.DataFrame
+            날짜 x 만기 수익률 패널 (%), FRED 를 사용할 수 없으면 빈 DataFrame
+        """
+        return self._single_flight(
+            ('yields', 'history', start),
+            lambda: self._get_treasury_yield_history(start, max_workers),
+            cacheable=lambda panel: not panel.isna().all().any()
+        )
+
+    def _get_treasury_yield_history(self, start, max_workers):
+        tenors = list(TREASURY_SERIES)
+        series_ids = list(TREASURY_SERIES.values())
+
+        if not self.backend.has_fred:
+            if self.cache is None:
+                return pd.DataFrame(columns=tenors, dtype=float)
+            panel = self.cache.load_series_panel(series_ids, start=start)
+            panel.columns = tenors
+            return panel
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            fetched = dict(zip(tenors, pool.map(
+                lambda series_id: self._refresh_fred_series(series_id, start), series_ids
+            )))
+
+        if self.cache is not None:
+            panel = self.cache.load_series_panel(series_ids, start=start)
+            panel.columns = tenors
+            return panel
+
+        panel = pd.DataFrame({tenor: data for tenor, data in fetched.items() if data is not None})
+        return panel.reindex(columns=tenors).sort_index()
+
+    def _refresh_fred_series(self, series_id, start=None):
+        """
+        FRED 시계열 조회 (캐시가 있으면 마지막 관측일 이후만 조회하여 저장)
+
+        Returns:
+        --------
+        pd.Series or None
+            이번에 조회한 관측값 (조회하지 않았거나 실패하면 None)
+        """
+        observation_start = start
+        if self.cache is not None:
+            meta = self.cache.get_series_meta(series_id)
+            if meta is not None:
+                if time.time() - meta['updated_at'] < self.cache.stale_after:
+                    self.metrics.record_cache_hit('fred')
+                    return None
+                # 마지막 관측일부터 다시 조회 (수정치 반영)
+                observation_start = meta['last_date']
+            else:
+                observation_start = None
+
+        try:
+            data = self.scheduler.call(
+                'fred', self.backend.fred_series, series_id, observation_start=observation_start
+            )
+        except Exception as e:
+            print(f"FRED 데이터 조회 오류 ({series_id}): {e}")
+            return None
+
+        if self.cache is not None:
+            self.cache.store_series(series_id, data)
+        return data
 
     def calculate_returns(self, data, period='daily'):
         """수익률 계산"""
@@ -123,6 +641,136 @@ class DataFetcher:
         returns = self.calculate_returns(data)
         return returns.rolling(window=window).std() * np.sqrt(252)
 
+    def create_return_stream(self, data, window=30, periods_per_year=252):
+        """
+        실시간 봉 입력용 이동 수익률/변동성 계산기 생성
+
+        과거 데이터로 초기화한 뒤 ``update(price)`` 로 새 봉을 넣으면 전체 이력을
+        다시 계산하지 않고 봉당 상수 시간에 변동성이 갱신됩니다.
+
+        Returns:
+        --------
+        RollingReturnStream
+        """
+        return RollingReturnStream.from_history(data, window=window, periods_per_year=periods_per_year)
+
     def calculate_correlation_matrix(self, returns_df):
         """상관관계 행렬 계산"""
         return returns_df.corr()
+
+    def build_price_panel(self, data_dict, field='Close', interval="1d", dtype=None):
+        """
+        종목별 OHLCV 데이터를 날짜 정렬된 가격 패널로 변환
+
+        모든 종목을 한 번의 concat 으로 정렬합니다. 일별 이상 봉은 거래소 시간대를
+        제거하고 현지 날짜 기준으로 맞추므로, 시간대가 다른 시장(예: 미국/한국)도
+        같은 날짜 행에 놓입니다.
+
+        Parameters:
+        -----------
+        data_dict : dict
+            티커별 OHLCV DataFrame (get_multiple_stocks 결과)
+        field : str
+            사용할 가격 컬럼
+        interval : str
+            봉 간격 (분/시간 봉은 UTC 시각 기준으로 정렬)
+        dtype : str or np.dtype, optional
+            저장 dtype (예: 'float32')
+
+        Returns:
+        --------
+        pd.DataFrame
+            날짜 x 종목 가격 패널 (데이터가 없는 종목은 제외)
+        """
+        series = {}
+        for ticker, data in data_dict.items():
+            if data.empty or field not in data.columns:
+                continue
+            prices = data[field]
+            if prices.index.tz is not None:
+                if is_intraday(interval):
+                    prices = prices.tz_convert('UTC')
+                else:
+                    prices = prices.tz_localize(None)
+            if not is_intraday(interval):
+                # 공유 중인 원본 DataFrame 의 인덱스를 바꾸지 않도록 새 Series 생성
+                prices = prices.set_axis(prices.index.normalize())
+            series[ticker] = prices[~prices.index.duplicated(keep='last')]
+
+        if not series:
+            return pd.DataFrame()
+
+        panel = pd.concat(series, axis=1, join='outer', sort=True)
+        return panel.astype(dtype) if dtype is not None else panel
+
+    def build_returns_panel(self, prices, missing='ffill', dtype=np.float64, as_array=False):
+        """
+        가격 패널로부터 수익률 패널 계산
+
+        Parameters:
+        -----------
+        prices : pd.DataFrame
+            build_price_panel 결과
+        missing : str
+            결측 처리 방식
+            - 'ffill': 휴장일 등 결측 가격을 직전 가격으로 채움 (해당일 수익률 0, 기존 방식)
+            - 'drop': 결측 가격이 걸친 수익률 제거 (결측일과 그 다음 날 모두 제외)
+            - 'zero': 결측 수익률을 0으로 채움 (종목별 상장 전 구간 포함)
+        dtype : np.dtype
+            결과 dtype (float32 사용 시 메모리 절반)
+        as_array : bool
+            True 이면 (관측치 x 종목) C-연속 NumPy 배열 반환
+
+        Returns:
+        --------
+        pd.DataFrame or np.ndarray
+            수익률 패널
+        """
+        if missing == 'ffill':
+            # 채운 뒤에는 상장 전 구간만 결측으로 남음
+            returns = prices.ffill().pct_change(fill_method=None).iloc[1:].dropna()
+        elif missing == 'drop':
+            returns = prices.pct_change(fill_method=None).iloc[1:].dropna()
+        elif missing == 'zero':
+            returns = prices.pct_change(fill_method=None).iloc[1:].fillna(0.0)
+        else:
+            raise ValueError(f"지원하지 않는 결측 처리 방식입니다: {missing}")
+
+        values = np.ascontiguousarray(returns.to_numpy(dtype=dtype))
+        if as_array:
+            return values
+        return pd.DataFrame(values, index=returns.index, columns=returns.columns)
+
+
+def _or_empty(data):
+    """조회 실패(None) 를 빈 DataFrame 으로 변환"""
+    return pd.DataFrame() if data is None else data
+
+
+def _is_empty(value):
+    """조회 실패로 간주할 빈 결과 여부 (DataFrame, (calls, puts), dict)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, tuple):
+        return all(_is_empty(v) for v in value)
+    if isinstance(value, dict):
+        return len(value) == 0
+    return value is None
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_fetcher():
+    """
+    프로세스 전체에서 공유하는 DataFetcher
+
+    Streamlit 세션마다 DataFetcher 를 새로 만들면 메모리 캐시와 진행 중 요청
+    공유가 되지 않으므로, 대시보드는 이 함수로 얻은 인스턴스를 사용합니다.
+    """
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = DataFetcher()
+        return _shared_fetcher
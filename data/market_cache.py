@@ -0,0 +1,401 @@
+"""
+시장 데이터 영구 캐시 모듈 (SQLite)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pandas as pd
+
+# 기본 캐시 파일 위치 (환경 변수 FM_DASH_CACHE_PATH 로 변경 가능)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".fm_dash", "market_data.sqlite")
+
+# 저장 대상 컬럼 (yfinance history 컬럼명 -> DB 컬럼명)
+OHLCV_COLUMNS = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+    'Dividends': 'dividends',
+    'Stock Splits': 'stock_splits'
+}
+
+# 'max' 기간처럼 전체 이력을 보유한 경우의 커버리지 시작값
+FULL_HISTORY_TS = -(2**63) + 1
+
+
+def is_intraday(interval):
+    """분/시간 단위 봉 여부 ('1m', '90m', '1h' 등, '1mo' 제외)"""
+    return interval[-1] in ('m', 'h')
+
+
+def is_session_period(period):
+    """최근 N개 거래일 기간 ('5d' 등) 여부 ('ytd', 'max' 제외)"""
+    period = period.lower()
+    return period.endswith('d') and period[:-1].isdigit()
+
+
+def period_start(period, now=None):
+    """
+    yfinance period 문자열에 해당하는 조회 시작 시점 계산
+
+    Parameters:
+    -----------
+    period : str
+        '5d', '1mo', '6mo', '1y', 'ytd', 'max' 등
+    now : pd.Timestamp, optional
+        기준 시점 (UTC), 기본값은 현재 시각
+
+    Returns:
+    --------
+    pd.Timestamp or None
+        UTC 기준 시작 시점 ('max' 이면 None)
+    """
+    now = now if now is not None else pd.Timestamp.now(tz='UTC')
+    period = period.lower()
+
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+
+    if period.endswith('mo'):
+        start = now - pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith('y'):
+        start = now - pd.DateOffset(years=int(period[:-1]))
+    elif period.endswith('d'):
+        start = now - timedelta(days=int(period[:-1]))
+    else:
+        raise ValueError(f"지원하지 않는 기간입니다: {period}")
+
+    return start.normalize()
+
+
+def slice_period(data, period, now=None):
+    """
+    OHLCV 데이터를 yfinance period 기준으로 자르기
+
+    'Nd' 기간은 yfinance와 동일하게 최근 N개 거래일 기준으로 자릅니다.
+    """
+    if data.empty:
+        return data
+
+    if is_session_period(period):
+        sessions = data.index.normalize().unique()
+        return data[data.index >= sessions[-int(period[:-1]):][0]]
+
+    start = period_start(period, now=now)
+    if start is None:
+        return data
+    if data.index.tz is None:
+        start = start.tz_localize(None)
+    return data[data.index >= start]
+
+
+class MarketDataCache:
+    """SQLite 기반 OHLCV 영구 캐시 (ticker/interval 단위 증분 갱신)"""
+
+    def __init__(self, path=None, stale_after=900):
+        """
+        Parameters:
+        -----------
+        path : str, optional
+            SQLite 파일 경로
+        stale_after : float
+            마지막 갱신 후 재조회 없이 디스크 데이터를 그대로 쓰는 시간 (초)
+        """
+        self.path = path or os.environ.get('FM_DASH_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv (
+                    ticker TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL,
+                    volume REAL, dividends REAL, stock_splits REAL,
+                    PRIMARY KEY (ticker, interval, ts)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv_meta (
+                    ticker TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start_ts INTEGER NOT NULL,
+                    tz TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, interval)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fred_series (
+                    series_id TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    value REAL,
+                    PRIMARY KEY (series_id, date)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fred_meta (
+                    series_id TEXT PRIMARY KEY,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 commit, 예외 시 rollback 후 항상 close)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_meta(self, ticker, interval):
+        """
+        캐시 메타데이터 조회
+
+        Returns:
+        --------
+        dict or None
+            start_ts (커버리지 시작, UTC ns), last_ts (마지막 봉), prev_ts (마지막 직전 봉,
+            봉이 하나면 last_ts), tz, updated_at
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT start_ts, tz, updated_at FROM ohlcv_meta WHERE ticker = ? AND interval = ?",
+                (ticker, interval)
+            ).fetchone()
+            if row is None:
+                return None
+            recent = [r[0] for r in conn.execute(
+                "SELECT ts FROM ohlcv WHERE ticker = ? AND interval = ? ORDER BY ts DESC LIMIT 2",
+                (ticker, interval)
+            ).fetchall()]
+
+        last_ts = recent[0] if recent else None
+        prev_ts = recent[-1] if recent else None
+        return {'start_ts': row[0], 'tz': row[1], 'updated_at': row[2], 'last_ts': last_ts, 'prev_ts': prev_ts}
+
+    def is_fresh(self, meta, max_age=None):
+        """마지막 갱신이 max_age (기본값 stale_after) 초 이내인지 여부"""
+        max_age = self.stale_after if max_age is None else max_age
+        return meta is not None and (time.time() - meta['updated_at']) < max_age
+
+    def covers(self, meta, start):
+        """캐시가 start 시점부터의 이력을 보유하는지 여부 (start=None 은 전체 이력)"""
+        if meta is None or meta['last_ts'] is None:
+            return False
+        if start is None:
+            return meta['start_ts'] == FULL_HISTORY_TS
+        return meta['start_ts'] <= _to_ns(start)
+
+    def load_ohlcv(self, ticker, interval, start=None):
+        """
+        저장된 OHLCV 데이터 조회
+
+        Parameters:
+        -----------
+        start : pd.Timestamp, optional
+            조회 시작 시점 (None 이면 전체)
+
+        Returns:
+        --------
+        pd.DataFrame
+            yfinance history 와 동일한 형태 (거래소 시간대 인덱스)
+        """
+        query = "SELECT ts, " + ", ".join(OHLCV_COLUMNS.values()) + \
+                " FROM ohlcv WHERE ticker = ? AND interval = ?"
+        params = [ticker, interval]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(_to_ns(start))
+        query += " ORDER BY ts"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+            tz_row = conn.execute(
+                "SELECT tz FROM ohlcv_meta WHERE ticker = ? AND interval = ?",
+                (ticker, interval)
+            ).fetchone()
+
+        if not rows:
+            return pd.DataFrame()
+
+        data = pd.DataFrame.from_records(rows, columns=['ts'] + list(OHLCV_COLUMNS))
+        index = pd.to_datetime(data.pop('ts'), unit='ns', utc=True)
+        if tz_row is not None and tz_row[0]:
+            index = index.dt.tz_convert(tz_row[0])
+        data.index = pd.DatetimeIndex(index, name='Datetime' if is_intraday(interval) else 'Date')
+
+        # 원본에 없던 컬럼(전부 NULL)은 제거
+        data = data.dropna(axis=1, how='all')
+        if 'Volume' in data.columns and data['Volume'].notna().all():
+            data['Volume'] = data['Volume'].astype('int64')
+        return data
+
+    def store_ohlcv(self, ticker, interval, data, covers_from=None):
+        """
+        OHLCV 데이터 저장 (같은 시점의 기존 봉은 덮어씀)
+
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            yfinance history 결과
+        covers_from : pd.Timestamp or int, optional
+            이번 조회가 보장하는 이력 시작 시점 (전체 이력이면 FULL_HISTORY_TS)
+        """
+        if data.empty:
+            return
+
+        index = data.index
+        tz = str(index.tz) if index.tz is not None else None
+        ts = (index.tz_convert('UTC') if tz else index.tz_localize('UTC')).as_unit('ns').asi8
+
+        values = data.reindex(columns=list(OHLCV_COLUMNS)).astype(float)
+        values = values.astype(object).where(values.notna(), None)
+        records = [
+            (ticker, interval, int(t), *row)
+            for t, row in zip(ts, values.itertuples(index=False, name=None))
+        ]
+
+        if covers_from is None:
+            new_start = int(ts.min())
+        elif covers_from == FULL_HISTORY_TS:
+            new_start = FULL_HISTORY_TS
+        else:
+            new_start = min(_to_ns(covers_from), int(ts.min()))
+
+        placeholders = ", ".join(["?"] * (3 + len(OHLCV_COLUMNS)))
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv (ticker, interval, ts, " +
+                ", ".join(OHLCV_COLUMNS.values()) + f") VALUES ({placeholders})",
+                records
+            )
+            conn.execute("""
+                INSERT INTO ohlcv_meta (ticker, interval, start_ts, tz, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (ticker, interval) DO UPDATE SET
+                    start_ts = MIN(start_ts, excluded.start_ts),
+                    tz = COALESCE(tz, excluded.tz),
+                    updated_at = excluded.updated_at
+            """, (ticker, interval, new_start, tz, time.time()))
+
+    def touch(self, ticker, interval):
+        """신규 봉이 없을 때 갱신 시각만 기록"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE ohlcv_meta SET updated_at = ? WHERE ticker = ? AND interval = ?",
+                (time.time(), ticker, interval)
+            )
+
+    def get_series_meta(self, series_id):
+        """
+        FRED 시계열 캐시 메타데이터 조회
+
+        Returns:
+        --------
+        dict or None
+            last_date (마지막 관측일, pd.Timestamp), updated_at
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT updated_at FROM fred_meta WHERE series_id = ?", (series_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            last_date = conn.execute(
+                "SELECT MAX(date) FROM fred_series WHERE series_id = ?", (series_id,)
+            ).fetchone()[0]
+
+        return {
+            'updated_at': row[0],
+            'last_date': pd.Timestamp(last_date) if last_date else None
+        }
+
+    def load_series_panel(self, series_ids, start=None):
+        """
+        여러 FRED 시계열을 날짜 x 시리즈 패널로 조회
+
+        Parameters:
+        -----------
+        series_ids : list of str
+            FRED 시리즈 ID 목록 (컬럼 순서)
+        start : str or pd.Timestamp, optional
+            조회 시작일
+
+        Returns:
+        --------
+        pd.DataFrame
+            날짜 인덱스, 시리즈별 컬럼
+        """
+        placeholders = ", ".join(["?"] * len(series_ids))
+        query = f"SELECT date, series_id, value FROM fred_series WHERE series_id IN ({placeholders})"
+        params = list(series_ids)
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        if not rows:
+            return pd.DataFrame(columns=list(series_ids), dtype=float)
+
+        long = pd.DataFrame.from_records(rows, columns=['date', 'series_id', 'value'])
+        panel = long.pivot(index='date', columns='series_id', values='value')
+        panel.index = pd.DatetimeIndex(panel.index, name='date')
+        panel.columns.name = None
+        return panel.reindex(columns=list(series_ids)).sort_index()
+
+    def store_series(self, series_id, series):
+        """FRED 시계열 저장 (같은 날짜의 기존 값은 덮어씀)"""
+        records = [
+            (series_id, pd.Timestamp(date).strftime('%Y-%m-%d'), None if pd.isna(value) else float(value))
+            for date, value in series.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO fred_series (series_id, date, value) VALUES (?, ?, ?)",
+                records
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO fred_meta (series_id, updated_at) VALUES (?, ?)",
+                (series_id, time.time())
+            )
+
+    def clear(self, ticker=None):
+        """캐시 삭제 (ticker 지정 시 해당 종목만)"""
+        with self._lock, self._connect() as conn:
+            if ticker is None:
+                conn.execute("DELETE FROM ohlcv")
+                conn.execute("DELETE FROM ohlcv_meta")
+                conn.execute("DELETE FROM fred_series")
+                conn.execute("DELETE FROM fred_meta")
+            else:
+                conn.execute("DELETE FROM ohlcv WHERE ticker = ?", (ticker,))
+                conn.execute("DELETE FROM ohlcv_meta WHERE ticker = ?", (ticker,))
+
+
+def _to_ns(ts):
+    """Timestamp/정수를 UTC 기준 나노초 정수로 변환"""
+    if isinstance(ts, int):
+        return ts
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.tz_convert('UTC').as_unit('ns').value)
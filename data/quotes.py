@@ -0,0 +1,152 @@
+"""
+시세/종목 정보 캐시 모듈 (백그라운드 갱신)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .data_fetcher import get_shared_fetcher
+
+# 홈 화면 주요 지수
+HOME_INDICES = {
+    '^GSPC': 'S&P 500',
+    '^IXIC': 'NASDAQ',
+    '^KS11': 'KOSPI'
+}
+
+
+class QuoteService:
+    """
+    지수/종목 시세와 종목 정보 캐시
+
+    값이 만료되면 이전 값을 그대로 반환하면서 백그라운드에서 갱신하므로 화면
+    렌더링이 네트워크를 기다리지 않습니다. 값이 아직 없는 최초 조회만 최대
+    cold_timeout 초까지 기다립니다.
+    """
+
+    def __init__(self, fetcher=None, quote_ttl=60, info_ttl=3600, cold_timeout=5.0):
+        """
+        Parameters:
+        -----------
+        fetcher : DataFetcher, optional
+            조회에 사용할 DataFetcher (기본값은 공유 인스턴스)
+        quote_ttl : float
+            시세 유효 시간 (초)
+        info_ttl : float
+            종목 정보 유효 시간 (초)
+        cold_timeout : float
+            캐시에 값이 없을 때 최초 조회를 기다리는 최대 시간 (초)
+        """
+        self.fetcher = fetcher if fetcher is not None else get_shared_fetcher()
+        self.quote_ttl = quote_ttl
+        self.info_ttl = info_ttl
+        self.cold_timeout = cold_timeout
+
+        self._quotes = {}        # ticker -> (조회 시각, 시세 dict)
+        self._info = {}          # ticker -> (조회 시각, 정보 dict)
+        self._pending = {}       # ('quote'|'info', ticker) -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='quote-refresh')
+
+    def get_quotes(self, tickers):
+        """
+        여러 종목의 최신 시세 조회 (일괄 요청 1회)
+
+        Returns:
+        --------
+        dict
+            티커별 {'price', 'change_pct', 'as_of'} (조회되지 않은 종목은 제외)
+        """
+        tickers = list(tickers)
+        future = self._schedule('quote', tickers, self._quotes, self.quote_ttl, self._refresh_quotes)
+        self._wait_cold(future, tickers, self._quotes)
+
+        with self._lock:
+            return {t: self._quotes[t][1] for t in tickers if t in self._quotes}
+
+    def get_info(self, ticker):
+        """
+        종목 기본 정보 조회 (DataFetcher.get_stock_info 캐시)
+
+        Returns:
+        --------
+        dict
+            종목 정보 (아직 조회되지 않았으면 빈 dict)
+        """
+        future = self._schedule('info', [ticker], self._info, self.info_ttl, self._refresh_info)
+        self._wait_cold(future, [ticker], self._info)
+
+        with self._lock:
+            return self._info[ticker][1] if ticker in self._info else {}
+
+    def _schedule(self, kind, tickers, store, ttl, refresh):
+        """만료되었거나 없는 종목을 백그라운드 갱신 (이미 진행 중인 종목은 제외)"""
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                t for t in tickers
+                if (t not in store or now - store[t][0] >= ttl) and (kind, t) not in self._pending
+            ]
+            if not stale:
+                pending = [self._pending[(kind, t)] for t in tickers if (kind, t) in self._pending]
+                return pending[0] if pending else None
+
+            future = self._executor.submit(refresh, stale)
+            for t in stale:
+                self._pending[(kind, t)] = future
+
+        future.add_done_callback(lambda _: self._clear_pending(kind, stale))
+        return future
+
+    def _clear_pending(self, kind, tickers):
+        with self._lock:
+            for t in tickers:
+                self._pending.pop((kind, t), None)
+
+    def _wait_cold(self, future, tickers, store):
+        """캐시에 값이 전혀 없는 종목이 있을 때만 갱신 완료를 기다림"""
+        if future is None:
+            return
+        with self._lock:
+            cold = any(t not in store for t in tickers)
+        if cold:
+            wait([future], timeout=self.cold_timeout)
+
+    def _refresh_quotes(self, tickers):
+        data_dict = self.fetcher.get_multiple_stocks(tickers, period="5d", max_age=self.quote_ttl)
+        now = time.monotonic()
+
+        quotes = {}
+        for ticker, data in data_dict.items():
+            if len(data) < 2:
+                continue
+            close = data['Close']
+            quotes[ticker] = (now, {
+                'price': float(close.iloc[-1]),
+                'change_pct': float((close.iloc[-1] / close.iloc[-2] - 1) * 100),
+                'as_of': close.index[-1]
+            })
+
+        with self._lock:
+            self._quotes.update(quotes)
+
+    def _refresh_info(self, tickers):
+        for ticker in tickers:
+            info = self.fetcher.get_stock_info(ticker)
+            if info:
+                with self._lock:
+                    self._info[ticker] = (time.monotonic(), info)
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_quote_service():
+    """프로세스 전체에서 공유하는 QuoteService"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = QuoteService()
+        return _shared_service
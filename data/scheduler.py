@@ -0,0 +1,155 @@
+"""
+원천 데이터 요청 스케줄러 (속도 제한, 재시도, 지표 수집)
+"""
+
+import random
+import threading
+import time
+
+import pandas as pd
+
+# 재시도해도 결과가 바뀌지 않는 오류
+NON_RETRYABLE_ERRORS = (FileNotFoundError, KeyError, ValueError, NotImplementedError)
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (초당 rate 개, 최대 capacity 개까지 누적)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class FetchMetrics:
+    """요청 종류별 지연 시간, 재시도, 캐시 적중, 실패 집계"""
+
+    FIELDS = ['requests', 'failures', 'retries', 'cache_hits', 'total_latency', 'max_latency']
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def _get(self, kind):
+        if kind not in self._counters:
+            self._counters[kind] = dict.fromkeys(self.FIELDS, 0)
+        return self._counters[kind]
+
+    def record_request(self, kind, latency, failed=False):
+        with self._lock:
+            counter = self._get(kind)
+            counter['requests'] += 1
+            counter['total_latency'] += latency
+            counter['max_latency'] = max(counter['max_latency'], latency)
+            if failed:
+                counter['failures'] += 1
+
+    def record_retry(self, kind):
+        with self._lock:
+            self._get(kind)['retries'] += 1
+
+    def record_cache_hit(self, kind):
+        with self._lock:
+            self._get(kind)['cache_hits'] += 1
+
+    def snapshot(self):
+        """
+        현재까지의 지표
+
+        Returns:
+        --------
+        pd.DataFrame
+            요청 종류별 requests, failures, retries, cache_hits, avg_latency, max_latency (초)
+        """
+        with self._lock:
+            df = pd.DataFrame.from_dict(self._counters, orient='index', columns=self.FIELDS)
+
+        requests = df['requests'].where(df['requests'] > 0)
+        df['avg_latency'] = (df['total_latency'] / requests).fillna(0.0)
+        return df[['requests', 'failures', 'retries', 'cache_hits', 'avg_latency', 'max_latency']]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class FetchScheduler:
+    """
+    원천 데이터 요청 실행기
+
+    모든 요청은 토큰 버킷으로 속도를 제한하고, 일시적 오류는 지수 백오프
+    (full jitter)로 재시도합니다.
+    """
+
+    def __init__(self, rate=None, burst=None, max_retries=3, base_delay=0.5, max_delay=8.0, metrics=None):
+        """
+        Parameters:
+        -----------
+        rate : float, optional
+            초당 최대 요청 수 (None 이면 제한 없음)
+        burst : float, optional
+            순간 허용 요청 수 (기본값은 rate)
+        max_retries : int
+            최대 재시도 횟수
+        base_delay, max_delay : float
+            백오프 기본/최대 대기 시간 (초)
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = metrics if metrics is not None else FetchMetrics()
+
+    def backoff(self, attempt):
+        """attempt 번째 재시도 전 대기 시간 (0 ~ min(max_delay, base_delay * 2^attempt))"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, kind, func, *args, **kwargs):
+        """
+        속도 제한과 재시도를 적용하여 func 실행
+
+        Parameters:
+        -----------
+        kind : str
+            지표 집계용 요청 종류 ('history', 'info' 등)
+
+        Returns:
+        --------
+        func 반환값 (재시도를 모두 실패하면 마지막 예외를 그대로 발생)
+        """
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.metrics.record_request(kind, time.perf_counter() - start, failed=True)
+                if attempt >= self.max_retries or isinstance(e, NON_RETRYABLE_ERRORS):
+                    raise
+                self.metrics.record_retry(kind)
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+
+            self.metrics.record_request(kind, time.perf_counter() - start)
+            return result
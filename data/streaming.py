@@ -0,0 +1,150 @@
+"""
+스트리밍 수익률/변동성 계산 모듈 (봉당 O(1) 갱신)
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+class RollingReturnStream:
+    """
+    실시간 봉 입력용 이동 수익률 통계
+
+    새 종가가 들어올 때마다 수익률, 이동 평균/분산(Welford 방식의 슬라이딩 갱신),
+    연율화 변동성을 상수 시간에 갱신합니다. 결과는
+    ``DataFetcher.calculate_volatility`` (pct_change().rolling(window).std())와 같습니다.
+    """
+
+    def __init__(self, window=30, periods_per_year=252):
+        """
+        Parameters:
+        -----------
+        window : int
+            이동 창 크기 (수익률 개수)
+        periods_per_year : float
+            연율화 계수 (일봉 252, 분봉은 252 * 하루 봉 수)
+        """
+        if window < 2:
+            raise ValueError("window 는 2 이상이어야 합니다.")
+
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.last_price = None
+        self.last_return = np.nan
+        self._returns = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_resync = 0
+
+    @classmethod
+    def from_history(cls, data, window=30, periods_per_year=252):
+        """
+        과거 종가로 초기 상태를 채운 계산기 생성
+
+        Parameters:
+        -----------
+        data : pd.DataFrame or pd.Series
+            'Close' 컬럼이 있는 OHLCV 데이터 또는 종가 시계열
+        """
+        closes = data['Close'] if isinstance(data, pd.DataFrame) else data
+        stream = cls(window, periods_per_year)
+
+        closes = closes.dropna().to_numpy(dtype=float)
+        if len(closes) == 0:
+            return stream
+
+        # 마지막 window 개 수익률만 있으면 충분
+        tail = closes[-(window + 1):]
+        returns = tail[1:] / tail[:-1] - 1
+        stream._returns.extend(returns)
+        stream._resync()
+        stream.last_price = tail[-1]
+        if len(returns) > 0:
+            stream.last_return = returns[-1]
+        return stream
+
+    def update(self, price):
+        """
+        새 종가 반영
+
+        Returns:
+        --------
+        dict
+            return, mean, variance, volatility (창이 채워지기 전에는 NaN)
+        """
+        price = float(price)
+        if self.last_price is None:
+            self.last_price = price
+            return self.stats()
+
+        r = price / self.last_price - 1
+        self.last_price = price
+        self.last_return = r
+
+        if len(self._returns) == self.window:
+            # 가장 오래된 수익률을 새 수익률로 교체
+            old = self._returns[0]
+            self._returns.append(r)
+            delta = r - old
+            new_mean = self._mean + delta / self.window
+            self._m2 += delta * (r - new_mean + old - self._mean)
+            self._mean = new_mean
+        else:
+            self._returns.append(r)
+            n = len(self._returns)
+            delta = r - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (r - self._mean)
+
+        # 누적 부동소수점 오차 보정 (window 번마다 재계산, 봉당 분할 상환 O(1))
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+
+        return self.stats()
+
+    def update_many(self, prices, index=None):
+        """
+        여러 종가를 순서대로 반영
+
+        Returns:
+        --------
+        pd.DataFrame
+            봉별 return, mean, variance, volatility
+        """
+        rows = [self.update(p) for p in prices]
+        return pd.DataFrame(rows, index=index)
+
+    def _resync(self):
+        """창 내부 수익률로 평균/제곱합 재계산"""
+        values = np.fromiter(self._returns, dtype=float, count=len(self._returns))
+        self._mean = values.mean() if len(values) else 0.0
+        self._m2 = float(((values - self._mean) ** 2).sum())
+        self._since_resync = 0
+
+    @property
+    def mean(self):
+        """창 내 평균 수익률"""
+        return self._mean if len(self._returns) == self.window else np.nan
+
+    @property
+    def variance(self):
+        """창 내 수익률 표본분산 (ddof=1)"""
+        if len(self._returns) < self.window:
+            return np.nan
+        return max(self._m2, 0.0) / (self.window - 1)
+
+    @property
+    def volatility(self):
+        """연율화 변동성"""
+        return np.sqrt(self.variance * self.periods_per_year)
+
+    def stats(self):
+        return {
+            'return': self.last_return,
+            'mean': self.mean,
+            'variance': self.variance,
+            'volatility': self.volatility
+        }
@@ -1 +1 @@
-from .individual_products import StockSimulator, BondPricer, OptionPricer, HedgeSimulator, InterestRateSwap
+from .individual_products import StockSimulator, HestonSimulator, MertonJumpSimulator, BondPricer, OptionPricer, HedgeSimulator, InterestRateSwap
@@ -0,0 +1,188 @@
+"""
+채권 포트폴리오 모듈 (현금흐름 행렬 기반 수익률 곡선 시나리오 재평가)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .individual_products import TENOR_YEARS
+from .yield_curve import YieldCurve
+
+# 현금흐름 시점 격자 (년, 월/분기/반기 지급 시점은 그대로 유지)
+TIME_GRID = 1 / 360
+
+
+class BondPortfolio:
+    """
+    고정금리 채권 포트폴리오
+
+    생성 시 채권 x 현금흐름 시점 희소 행렬과 시점 x 만기 선형 보간 행렬을 한 번
+    만들어 두고, 수익률 곡선 시나리오는 할인계수 행렬 (시나리오 x 시점) 과의
+    행렬곱 한 번으로 전체 채권을 재평가합니다. 곡선의 각 만기 수익률은 해당 시점의
+    할인율(연 compounding 회 복리, 기본값은 채권별 이자 지급 횟수)로 사용하며,
+    만기 사이는 선형 보간하고 양 끝 밖은 끝 값을 유지합니다. 적합된 YieldCurve 를
+    넘기면 만기 보간 대신 곡선의 할인계수를 같은 행렬곱에 사용합니다.
+
+    현금흐름은 만기일부터 1 / frequency 년 간격으로 거슬러 올라가며 배치하므로
+    잔존 만기가 지급 주기로 나누어떨어지지 않는 채권은 첫 이표까지의 기간이 짧아지고,
+    가격은 경과이자를 포함한 dirty price 입니다. 지급 시점은 time_grid 격자로
+    반올림하므로 시점 열의 수는 채권 수가 아니라 격자 크기로 제한됩니다.
+    """
+
+    def __init__(self, face_value, coupon_rate, maturity_years, frequency=2, quantity=1,
+                 tenors=None, compounding=None, names=None, time_grid=TIME_GRID):
+        """
+        Parameters:
+        -----------
+        face_value, coupon_rate, maturity_years : float or array-like
+            채권별 액면가, 연 표면이율 (소수), 잔존 만기 (년)
+        frequency : int or array-like
+            연간 이자 지급 횟수
+        quantity : float or array-like
+            보유 수량
+        tenors : dict, optional
+            {만기 라벨: 년} 곡선 만기 (기본값은 TENOR_YEARS)
+        compounding : int, optional
+            할인율 복리 횟수 (None 이면 채권별 frequency, 곡선 만기 수익률과 같은
+            기준의 채권은 BondPricer.price_bonds 와 같은 가격)
+        names : list, optional
+            채권 이름 (결과 index)
+        time_grid : float
+            현금흐름 시점 반올림 간격 (년, 기본값 1/360 은 반나절 이내 오차)
+        """
+        face_value, coupon_rate, maturity_years, frequency, quantity = (
+            np.atleast_1d(a) for a in np.broadcast_arrays(
+                *(np.asarray(x, dtype=float) for x in (face_value, coupon_rate, maturity_years, frequency, quantity))
+            )
+        )
+        # 보간을 위해 만기 순으로 정렬 (곡선 일부 만기만 사용할 수 있음)
+        self.tenors = dict(sorted((TENOR_YEARS if tenors is None else tenors).items(), key=lambda item: item[1]))
+        compounding = frequency if compounding is None else np.full(len(frequency), float(compounding))
+        self.quantity = quantity
+        self.names = list(names) if names is not None else list(range(len(face_value)))
+
+        if (maturity_years <= 0).any():
+            raise ValueError("잔존 만기는 0보다 커야 합니다.")
+        # 남은 지급 횟수 (만기 x 지급 횟수가 정수에 매우 가까우면 정수로 취급)
+        periods = np.ceil(np.round(maturity_years * frequency, 9)).astype(np.int64)
+
+        # 채권별 현금흐름 (시점, 금액) 을 만기일부터 거꾸로 한 번에 펼치기
+        bond_idx = np.repeat(np.arange(len(periods)), periods)
+        offsets = np.concatenate([[0], np.cumsum(periods)[:-1]])
+        k = np.arange(periods.sum()) - np.repeat(offsets, periods)
+        cf_times = maturity_years[bond_idx] - k / frequency[bond_idx]
+        # 최소 한 격자 뒤 시점으로 반올림 (만기가 격자보다 짧은 현금흐름도 t > 0 유지)
+        cf_times = np.maximum(np.round(cf_times / time_grid), 1) * time_grid
+        amounts = face_value[bond_idx] * coupon_rate[bond_idx] / frequency[bond_idx]
+        amounts = amounts + np.where(k == 0, face_value[bond_idx], 0.0)
+
+        # 열은 (시점, 복리 횟수) 조합 (복리 기준이 다른 채권은 같은 시점이라도 할인계수가 다름)
+        columns, col_idx = np.unique(
+            np.column_stack([cf_times, compounding[bond_idx]]), axis=0, return_inverse=True
+        )
+        self.times = columns[:, 0]
+        self.compounding = columns[:, 1]
+        self.cashflows = sparse.csr_matrix(
+            (amounts, (bond_idx, col_idx.ravel())), shape=(len(periods), len(self.times))
+        )
+        # 채움 비율이 높으면 (지급 시점이 겹치는 일반적인 장부) BLAS 밀집 행렬곱이 더 빠름
+        density = self.cashflows.nnz / max(1, np.prod(self.cashflows.shape))
+        self._dense_cashflows = self.cashflows.toarray() if density > 0.1 else None
+        # 포트폴리오 전체 시점별 현금흐름 (평가액 계산용)
+        self.book_cashflows = self.cashflows.T @ self.quantity
+
+        tenor_years = np.array(list(self.tenors.values()), dtype=float)
+        self.interpolation = np.column_stack(
+            [np.interp(self.times, tenor_years, e) for e in np.eye(len(tenor_years))]
+        )
+
+    def _curve_matrix(self, curves):
+        """곡선 입력 -> (시나리오 수, 만기 수) 배열 (pd 객체는 만기 라벨로 정렬)"""
+        if isinstance(curves, pd.Series):
+            curves = curves.reindex(list(self.tenors)).to_frame().T
+        elif isinstance(curves, pd.DataFrame):
+            curves = curves.reindex(columns=list(self.tenors))
+
+        matrix = np.atleast_2d(np.asarray(curves, dtype=float))
+        if matrix.shape[1] != len(self.tenors):
+            raise ValueError(f"곡선 만기 수({matrix.shape[1]})가 {len(self.tenors)} 와 다릅니다.")
+        if np.isnan(matrix).any():
+            raise ValueError("곡선에 누락된 만기 수익률이 있습니다.")
+        return matrix
+
+    def discount_factors(self, curves):
+        """
+        (시나리오 수, 현금흐름 열 수) 할인계수 (열은 times, compounding 순서)
+
+        Parameters:
+        -----------
+        curves : array-like, pd.Series, pd.DataFrame, YieldCurve or list of YieldCurve
+            만기별 수익률 (소수), (만기 수,) 또는 (시나리오 수, 만기 수),
+            또는 적합된 곡선 (현금흐름 시점의 할인계수를 그대로 사용)
+        """
+        fitted = _fitted_curves(curves)
+        if fitted is not None:
+            return np.vstack([curve.discount(self.times) for curve in fitted])
+
+        rates = self._curve_matrix(curves) @ self.interpolation.T
+        m = self.compounding[None, :]
+        return np.exp(-m * self.times[None, :] * np.log1p(rates / m))
+
+    def price(self, curves):
+        """
+        채권별 가격
+
+        Returns:
+        --------
+        np.ndarray
+            (시나리오 수, 채권 수) 가격 (곡선 1개이면 (채권 수,))
+        """
+        prices = self._price_matrix(self.discount_factors(curves))
+        return prices[0] if _is_single_curve(curves) else prices
+
+    def _price_matrix(self, discount_factors):
+        """(시나리오 수, 열 수) 할인계수 -> (시나리오 수, 채권 수) 가격"""
+        flows = self._dense_cashflows if self._dense_cashflows is not None else self.cashflows
+        return np.asarray(flows @ discount_factors.T).T
+
+    def price_on_curve(self, curve):
+        """적합된 YieldCurve 로 채권별 가격 계산 (price(curve) 와 같음)"""
+        return self.price(curve)
+
+    def value(self, curves):
+        """시나리오별 포트폴리오 평가액 (수량 가중, 시점별 합산 현금흐름 x 할인계수)"""
+        values = self.discount_factors(curves) @ self.book_cashflows
+        return values[0] if _is_single_curve(curves) else values
+
+    def scenario_pnl(self, base_curve, scenario_curves):
+        """
+        기준 곡선 대비 시나리오별 손익
+
+        Returns:
+        --------
+        pd.DataFrame
+            index 는 시나리오, 컬럼은 채권별 손익 (수량 반영) 과 'total'
+        """
+        prices = self._price_matrix(np.vstack([
+            self.discount_factors(base_curve), self.discount_factors(scenario_curves)
+        ]))
+        pnl = (prices[1:] - prices[0]) * self.quantity
+        index = scenario_curves.index if isinstance(scenario_curves, pd.DataFrame) else None
+        result = pd.DataFrame(pnl, columns=self.names, index=index)
+        result['total'] = pnl.sum(axis=1)
+        return result
+
+
+def _fitted_curves(curves):
+    """YieldCurve 또는 YieldCurve 목록이면 목록으로, 아니면 None"""
+    if isinstance(curves, YieldCurve):
+        return [curves]
+    if isinstance(curves, (list, tuple)) and curves and all(isinstance(c, YieldCurve) for c in curves):
+        return list(curves)
+    return None
+
+
+def _is_single_curve(curves):
+    """곡선 1개 입력 여부 (결과를 1차원으로 반환)"""
+    return isinstance(curves, YieldCurve) or (_fitted_curves(curves) is None and np.ndim(curves) == 1)
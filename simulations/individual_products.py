@@ -2,9 +2,22 @@
 고급 개별 금융상품 시뮬레이션 모듈
 """
 
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.stats import norm, qmc
+
+from .path_summary import FAN_PERCENTILES, PathFanAccumulator, summarize_paths
+from .yield_curve import parse_tenor
+from .risk import DEFAULT_CONFIDENCE_LEVELS, TailRiskAccumulator, _quantile_positions, _tail_table, tail_risk
+
+# sampling='sobol' 기본 블록 분할의 최소 독립 스크램블 수 (표준오차 추정용 반복 수)
+SOBOL_SCRAMBLES = 8
 
 class StockSimulator:
     """주식 시뮬레이터 (Monte Carlo)"""
@@ -17,71 +30,1094 @@ class StockSimulator:
         self.dt = dt
         self.n_steps = int(T / dt)
 
-    def simulate(self, n_simulations=1000):
-        """주가 경로 시뮬레이션"""
-        np.random.seed(42)
-        paths = np.zeros((n_simulations, self.n_steps + 1))
-        paths[:, 0] = self.S0
-
-        for t in range(1, self.n_steps + 1):
-            z = np.random.standard_normal(n_simulations)
-            paths[:, t] = paths[:, t-1] * np.exp(
-                (self.mu - 0.5 * self.sigma**2) * self.dt + 
-                self.sigma * np.sqrt(self.dt) * z
-            )
+    def simulate(self, n_simulations=1000, dtype=np.float64, out=None, seed=42,
+                 n_workers=1, executor='thread', block_size=None, sampling='mc'):
+        """
+        주가 경로 시뮬레이션 (벡터화, 병렬 실행 가능)
+
+        경로를 block_size 개씩 나누고, 블록마다 SeedSequence(seed).spawn 으로 만든
+        독립 난수 스트림을 사용합니다. 블록 분할은 작업자 수와 무관하므로 n_workers
+        와 executor 에 관계없이 같은 seed 에서 항상 같은 경로가 나옵니다.
+
+        Parameters:
+        -----------
+        n_simulations : int
+            경로 수
+        dtype : np.dtype
+            결과 dtype (float32 사용 시 메모리 절반, 내부 계산은 float64)
+        out : np.ndarray, optional
+            결과를 저장할 (n_simulations, n_steps + 1) 버퍼
+        seed : int
+            난수 seed
+        n_workers : int or None
+            작업자 수 (None 이면 CPU 코어 수, 1 이면 순차 실행)
+        executor : str
+            'thread' (NumPy 연산이 GIL 을 해제하므로 기본값) 또는 'process'
+        block_size : int, optional
+            블록당 경로 수 (기본값은 임시 배열이 약 32MB 가 되는 크기)
+        sampling : str
+            난수 생성 방식
+            - 'mc': 일반 Monte Carlo
+            - 'antithetic': 대조 변량 (행 2k, 2k+1 이 부호만 반대인 쌍)
+            - 'sobol': 스크램블 Sobol 준난수 + Brownian bridge
+              (블록마다 독립 스크램블, 블록 크기는 2의 거듭제곱으로 조정하며
+              기본값은 최소 SOBOL_SCRAMBLES 개 블록)
+
+        Returns:
+        --------
+        np.ndarray
+            (n_simulations, n_steps + 1) 주가 경로
+        """
+        shape = (n_simulations, self.n_steps + 1)
+        if out is None:
+            paths = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out 배열 크기가 {shape} 와 다릅니다: {out.shape}")
+        else:
+            paths = out
+
+        block_size = self._path_block_size(n_simulations, block_size, sampling)
+        blocks = _spawn_blocks(n_simulations, block_size, seed)
+
+        if executor == 'process' and n_workers != 1:
+            results = _run_blocks(self._path_block, blocks, n_workers, executor, paths.dtype, sampling)
+            for (start, stop, _), block in zip(blocks, results):
+                paths[start:stop] = block
+        else:
+            fill = lambda start, stop, seed_seq: self._fill_paths(seed_seq, paths[start:stop], sampling)
+            _run_blocks(fill, blocks, n_workers, 'thread')
 
         return paths
 
+    def simulate_fan(self, n_simulations=1000, percentiles=FAN_PERCENTILES, seed=42, sampling='mc',
+                     block_size=None, n_bins=1024):
+        """
+        경로 행렬을 보관하지 않는 시점별 분위수 밴드 (팬 차트용)
+
+        경로 수가 블록 하나 이내이면 정확한 분위수를, 그보다 많으면 블록별로
+        생성하면서 PathFanAccumulator 로 근사 분위수를 계산합니다. 블록 분할과
+        난수 스트림은 simulate 와 같습니다.
+
+        Returns:
+        --------
+        pd.DataFrame
+            index 는 시점(step), 컬럼은 'p5', 'p25', ... 와 'mean'
+        """
+        block_size = self._path_block_size(n_simulations, block_size, sampling)
+        blocks = _spawn_blocks(n_simulations, block_size, seed)
+
+        if len(blocks) <= 1:
+            return summarize_paths(self.simulate(n_simulations, seed=seed, block_size=block_size,
+                                                 sampling=sampling), percentiles)
+
+        accumulator = PathFanAccumulator(self.n_steps + 1, percentiles, n_bins)
+        buffer = np.empty((block_size, self.n_steps + 1))
+        for start, stop, seed_seq in blocks:
+            block = buffer[:stop - start]
+            self._fill_paths(seed_seq, block, sampling)
+            accumulator.update(block)
+        return accumulator.result()
+
+    def _default_block_size(self):
+        """블록당 임시 배열을 약 32MB (float64 4M 개) 이내로 유지하는 경로 수"""
+        return max(1, (1 << 22) // max(1, self.n_steps))
+
+    def _path_block_size(self, n_simulations, block_size=None, sampling='mc'):
+        """simulate/simulate_fan 블록 크기 (Sobol 기본값은 최소 SOBOL_SCRAMBLES 개의 독립 스크램블)"""
+        if block_size is None:
+            block_size = self._default_block_size()
+            if sampling == 'sobol':
+                block_size = min(block_size, max(1, n_simulations // SOBOL_SCRAMBLES))
+        return _sampling_block_size(block_size, sampling)
+
+    def _log_increments(self, rng, n, sampling='mc'):
+        """(n, n_steps) 단계별 로그수익률 생성"""
+        log_inc = _standard_normals(rng, n, self.n_steps, sampling)
+        log_inc *= self.sigma * np.sqrt(self.dt)
+        log_inc += (self.mu - 0.5 * self.sigma**2) * self.dt
+        return log_inc
+
+    def _terminal_log_returns(self, rng, n, sampling='mc'):
+        """(n,) 만기 누적 로그수익률 (GBM 은 만기 분포를 직접 생성)"""
+        drift = (self.mu - 0.5 * self.sigma**2) * self.dt * self.n_steps
+        vol = self.sigma * np.sqrt(self.dt * self.n_steps)
+        return drift + vol * _standard_normals(rng, n, 1, sampling)[:, 0]
+
+    def _fill_paths(self, seed_seq, out, sampling='mc'):
+        """블록 하나의 경로를 out 에 기록"""
+        rng = np.random.default_rng(seed_seq)
+        log_s = self._log_increments(rng, out.shape[0], sampling)
+        np.cumsum(log_s, axis=1, out=log_s)
+        log_s += np.log(self.S0)
+        np.exp(log_s, out=log_s)
+
+        out[:, 0] = self.S0
+        out[:, 1:] = log_s
+
+    def _path_block(self, start, stop, seed_seq, dtype, sampling='mc'):
+        """프로세스 작업자용: 블록 경로를 새 배열로 반환"""
+        out = np.empty((stop - start, self.n_steps + 1), dtype=dtype)
+        self._fill_paths(seed_seq, out, sampling)
+        return out
+
+    def simulate_terminal(self, n_simulations=100000, chunk_size=100000, track_extremes=False, seed=42,
+                          n_workers=1, executor='thread', sampling='mc'):
+        """
+        만기 주가만 생성하는 스트리밍 시뮬레이션
+
+        전체 경로 행렬을 만들지 않고 chunk_size 단위로 생성하여 만기 주가(와 경로별
+        최고/최저가)만 남깁니다. 최고/최저가가 필요 없으면 GBM 의 만기 분포를 직접
+        생성하므로 경로당 난수 1개만 사용합니다 (분포는 경로 생성과 동일).
+        chunk 마다 독립 난수 스트림을 쓰므로 작업자 수와 무관하게 결과가 같습니다.
+
+        Parameters:
+        -----------
+        n_simulations : int
+            경로 수
+        chunk_size : int
+            한 번에 생성할 경로 수
+        track_extremes : bool
+            경로별 최고가/최저가 집계 여부
+        seed : int
+            난수 seed
+        n_workers : int or None
+            작업자 수 (None 이면 CPU 코어 수)
+        executor : str
+            'thread' 또는 'process'
+        sampling : str
+            'mc', 'antithetic', 'sobol' (simulate 참고)
+
+        Returns:
+        --------
+        dict
+            'terminal' (n_simulations,) 만기 주가,
+            track_extremes 이면 'path_max', 'path_min' 추가
+        """
+        if track_extremes:
+            chunk_size = max(1, min(chunk_size, self._default_block_size()))
+
+        chunk_size = _sampling_block_size(chunk_size, sampling)
+        blocks = _spawn_blocks(n_simulations, chunk_size, seed)
+        results = _run_blocks(self._terminal_block, blocks, n_workers, executor, track_extremes, sampling)
+
+        keys = ['terminal', 'path_max', 'path_min'] if track_extremes else ['terminal']
+        return {key: np.concatenate([r[key] for r in results]) if results else np.empty(0) for key in keys}
+
+    def _terminal_block(self, start, stop, seed_seq, track_extremes, sampling='mc'):
+        """블록 하나의 만기 주가 (및 최고/최저가)"""
+        rng = np.random.default_rng(seed_seq)
+        n = stop - start
+        log_s0 = np.log(self.S0)
+
+        if not track_extremes:
+            return {'terminal': np.exp(log_s0 + self._terminal_log_returns(rng, n, sampling))}
+
+        log_s = self._log_increments(rng, n, sampling)
+        np.cumsum(log_s, axis=1, out=log_s)
+        return {
+            'terminal': np.exp(log_s0 + log_s[:, -1]),
+            'path_max': np.exp(log_s0 + np.maximum(log_s.max(axis=1), 0.0)),
+            'path_min': np.exp(log_s0 + np.minimum(log_s.min(axis=1), 0.0))
+        }
+
+    def calculate_risk_streaming(self, n_simulations=1000000, confidence=0.95, chunk_size=100000, seed=42,
+                                 n_workers=1, confidence_levels=None):
+        """
+        스트리밍 시뮬레이션 기반 VaR/CVaR 계산 (경로 행렬 미생성)
+
+        만기 수익률은 chunk 단위로 TailRiskAccumulator 에 넘기고 하위 꼬리만
+        보관하므로, 메모리는 n_simulations * (1 - 최저 신뢰수준) 정도입니다.
+        난수 스트림은 simulate_terminal(chunk_size=chunk_size) 와 같습니다.
+
+        Parameters:
+        -----------
+        confidence_levels : sequence of float, optional
+            함께 계산할 신뢰수준 목록 (결과 'table')
+
+        Returns:
+        --------
+        dict
+            var, cvar, mean_return, n_simulations, table (신뢰수준별 위험 표)
+        """
+        levels = sorted(set(confidence_levels or ()) | {confidence})
+        accumulator = TailRiskAccumulator(n_simulations, levels)
+
+        blocks = _spawn_blocks(n_simulations, chunk_size, seed)
+        group = n_workers or os.cpu_count() or 1
+        for i in range(0, len(blocks), group):
+            for result in _run_blocks(self._terminal_block, blocks[i:i + group], n_workers, 'thread', False):
+                accumulator.update(result['terminal'] / self.S0 - 1)
+
+        table = accumulator.result()
+        return {
+            'var': table.loc[confidence, 'var'],
+            'cvar': table.loc[confidence, 'cvar'],
+            'mean_return': accumulator.mean,
+            'n_simulations': n_simulations,
+            'table': table
+        }
+
+    def simulate_adaptive(self, confidence=0.95, rel_tol=0.01, abs_tol=None, ci_level=0.95,
+                          batch_size=10000, min_paths=10000, max_paths=2000000, max_time=5.0,
+                          seed=42, sampling='mc', eval_growth=1.25):
+        """
+        목표 정밀도 도달 시 중단하는 적응형 VaR/CVaR 시뮬레이션
+
+        만기 주가를 batch_size 개씩 생성하면서 VaR 의 순서통계량 신뢰구간과
+        CVaR 의 점근 표준오차를 계산하고, 두 신뢰구간 반폭이 모두 허용 오차
+        (max(abs_tol, rel_tol * |추정치|)) 이하가 되거나 max_paths / max_time 에
+        도달하면 멈춥니다. 배치 k 는 SeedSequence(seed) 의 k 번째 자식 스트림을
+        사용하므로 같은 경로 수의 simulate_terminal(chunk_size=batch_size) 결과와 같습니다.
+
+        두 추정치 모두 하위 꼬리 값만 필요하므로 max_paths 기준으로 필요한 하위
+        max_paths * (1 - confidence) + 신뢰구간 폭 개만 보관하고, 추정은 경로 수가
+        eval_growth 배씩 늘 때마다(기하 일정) 수행하여 배치당 비용을 일정하게 유지합니다.
+
+        Parameters:
+        -----------
+        confidence : float
+            VaR/CVaR 신뢰수준
+        rel_tol, abs_tol : float
+            신뢰구간 반폭의 상대/절대 허용 오차 (abs_tol 은 수익률 단위)
+        ci_level : float
+            추정치 신뢰구간 수준
+        batch_size : int
+            배치당 경로 수
+        min_paths, max_paths : int
+            최소/최대 경로 수
+        max_time : float
+            최대 실행 시간 (초, None 이면 제한 없음)
+        eval_growth : float
+            추정 시점 간 경로 수 증가 배율 (1 이하이면 매 배치 추정)
+
+        Returns:
+        --------
+        dict
+            var, cvar, var_ci, cvar_ci, cvar_se, n_simulations, elapsed, converged,
+            stop_reason ('tolerance', 'max_paths', 'max_time'), history (추정 시점별 DataFrame)
+        """
+        batch_size = _sampling_block_size(batch_size, sampling)
+        z = norm.ppf(0.5 + ci_level / 2)
+        p = 1 - confidence
+        root = np.random.SeedSequence(seed)
+
+        # max_paths 에서도 VaR 신뢰구간 상단 순위까지 포함하는 하위 꼬리 크기
+        keep = min(max_paths, int(np.ceil(max_paths * p + z * np.sqrt(max_paths * p * (1 - p)))) + 2)
+        smallest = np.empty(0)
+        pending = []
+        n_pending = 0
+
+        n_done = 0
+        next_eval = max(min_paths, 1)
+        history = []
+        start_time = time.perf_counter()
+
+        while True:
+            n = min(batch_size, max_paths - n_done)
+            block = self._terminal_block(n_done, n_done + n, root.spawn(1)[0], False, sampling)
+            returns = block['terminal'] / self.S0 - 1
+            n_done += n
+
+            # 보관 중인 하위 꼬리의 최댓값 이상은 다시 꼬리에 들어올 수 없음
+            if len(smallest) >= keep:
+                returns = returns[returns < smallest.max()]
+            pending.append(returns)
+            n_pending += len(returns)
+
+            elapsed = time.perf_counter() - start_time
+            out_of_paths = n_done >= max_paths
+            out_of_time = max_time is not None and elapsed >= max_time
+            evaluate = n_done >= next_eval or out_of_paths or out_of_time
+
+            # 후보가 꼬리 크기를 넘거나 추정할 때만 병합 (분할 상환 O(batch))
+            if evaluate or n_pending > keep:
+                merged = np.concatenate([smallest] + pending)
+                if len(merged) > keep:
+                    merged = np.partition(merged, keep - 1)[:keep]
+                smallest = merged
+                pending = []
+                n_pending = 0
+
+            if not evaluate:
+                continue
+
+            estimate = _tail_risk_interval(smallest, n_done, p, z)
+            estimate['elapsed'] = time.perf_counter() - start_time
+            estimate['n_simulations'] = n_done
+            history.append(estimate)
+            next_eval = max(next_eval, int(np.ceil(n_done * eval_growth)))
+
+            var_half = (estimate['var_hi'] - estimate['var_lo']) / 2
+            cvar_half = z * estimate['cvar_se']
+            var_tol = max(abs_tol or 0.0, rel_tol * abs(estimate['var']))
+            cvar_tol = max(abs_tol or 0.0, rel_tol * abs(estimate['cvar']))
+
+            if n_done >= min_paths and var_half <= var_tol and cvar_half <= cvar_tol:
+                stop_reason = 'tolerance'
+            elif out_of_paths:
+                stop_reason = 'max_paths'
+            elif out_of_time:
+                stop_reason = 'max_time'
+            else:
+                continue
+            break
+
+        return {
+            'var': estimate['var'],
+            'cvar': estimate['cvar'],
+            'var_ci': (estimate['var_lo'], estimate['var_hi']),
+            'cvar_ci': (estimate['cvar'] - cvar_half, estimate['cvar'] + cvar_half),
+            'cvar_se': estimate['cvar_se'],
+            'n_simulations': n_done,
+            'elapsed': estimate['elapsed'],
+            'converged': stop_reason == 'tolerance',
+            'stop_reason': stop_reason,
+            'history': pd.DataFrame(history).set_index('n_simulations')
+        }
+
+    def parameter_sweep(self, mus=None, sigmas=None, horizons=None, n_simulations=10000,
+                        confidence_levels=(0.95,), seed=42, sampling='mc'):
+        """
+        공통 난수(common random numbers) 기반 GBM 파라미터 민감도 분석
+
+        표준정규 난수를 한 번만 생성하여 각 만기의 브라운 운동 W_T 를 구한 뒤,
+        모든 (mu, sigma) 조합은 log(S_T / S0) = (mu - sigma^2 / 2) T + sigma W_T 로
+        재척도화만 합니다. 수익률이 W_T 에 대해 단조이므로 만기별로 W_T 를 한 번만
+        partial selection 하면 모든 격자점의 VaR/CVaR (tail_risk 와 같은 정의)을
+        얻을 수 있어, 격자점 간 차이에 난수 잡음이 섞이지 않습니다.
+
+        Parameters:
+        -----------
+        mus, sigmas, horizons : sequence of float, optional
+            기대 수익률, 변동성, 만기(년) 격자 (기본값은 현재 시뮬레이터 값)
+        n_simulations : int
+            경로 수
+        confidence_levels : sequence of float
+            VaR/CVaR 신뢰수준
+        sampling : str
+            'mc' 또는 'antithetic'
+
+        Returns:
+        --------
+        pd.DataFrame
+            (horizon, mu, sigma, confidence) 행마다 var, cvar, mean_return
+
+        Raises:
+        -------
+        TypeError
+            GBM 이 아닌 시뮬레이터 (Heston/Merton 은 W_T 재척도화가 성립하지 않음)
+        """
+        if type(self)._log_increments is not StockSimulator._log_increments:
+            raise TypeError("parameter_sweep 은 GBM(StockSimulator) 에서만 지원합니다.")
+        if sampling not in ('mc', 'antithetic'):
+            raise ValueError(f"parameter_sweep 에서 지원하지 않는 sampling 방식입니다: {sampling}")
+
+        mus = np.atleast_1d(np.asarray(self.mu if mus is None else mus, dtype=float))
+        sigmas = np.atleast_1d(np.asarray(self.sigma if sigmas is None else sigmas, dtype=float))
+        horizons = np.atleast_1d(np.asarray(self.T if horizons is None else horizons, dtype=float))
+        if (sigmas < 0).any():
+            raise ValueError("변동성은 0 이상이어야 합니다.")
+
+        brownian = self._brownian_checkpoints(horizons, n_simulations, seed, sampling)
+        lower, frac = _quantile_positions(n_simulations, confidence_levels)
+        upper = np.minimum(lower + 1, n_simulations - 1)
+        kth = np.unique(np.concatenate([lower, upper]))
+        sig = sigmas[None, :, None]
+
+        rows = []
+        for T, w in zip(horizons, brownian):
+            drift = ((mus[:, None] - 0.5 * sigmas[None, :]**2) * T)[:, :, None]
+            ordered = np.partition(w, kth)
+            # exp(sigma W) 의 평균 (sigma 별 1회)
+            mean_growth = np.array([np.exp(s * w).mean() for s in sigmas])
+            mean_return = np.exp(drift[:, :, 0]) * mean_growth[None, :] - 1
+
+            for c, lo, hi, f in zip(confidence_levels, lower, upper, frac):
+                r_lo = np.expm1(drift[:, :, 0] + sigmas[None, :] * ordered[lo])
+                r_hi = np.expm1(drift[:, :, 0] + sigmas[None, :] * ordered[hi])
+                q = r_lo + f * (r_hi - r_lo)
+
+                tail = np.expm1(drift + sig * ordered[None, None, :lo + 1])
+                in_tail = tail < q[:, :, None]
+                count = in_tail.sum(axis=2)
+                cvar = -np.where(in_tail, tail, 0.0).sum(axis=2) / np.where(count > 0, count, np.nan)
+
+                for i, mu in enumerate(mus):
+                    for j, sigma in enumerate(sigmas):
+                        rows.append({
+                            'horizon': T, 'mu': mu, 'sigma': sigma, 'confidence': c,
+                            'var': -q[i, j], 'cvar': cvar[i, j], 'mean_return': mean_return[i, j]
+                        })
+
+        return pd.DataFrame(rows)
+
+    def _brownian_checkpoints(self, horizons, n_simulations, seed, sampling='mc'):
+        """
+        (len(horizons), n_simulations) 각 만기의 브라운 운동 W_T
+
+        최장 만기까지 단계별 표준정규 난수를 시점 구간(step chunk) 단위로 생성하며
+        누적합만 유지하므로 메모리는 경로 수 * 구간 길이로 제한됩니다.
+        """
+        steps = np.array([int(T / self.dt) for T in horizons])
+        order = np.argsort(steps)
+        rng = np.random.default_rng(seed)
+        chunk = max(1, (1 << 22) // max(1, n_simulations))
+
+        total = np.zeros(n_simulations)
+        brownian = np.empty((len(horizons), n_simulations))
+        done = 0
+        for idx in order:
+            while done < steps[idx]:
+                width = min(chunk, steps[idx] - done)
+                total += _standard_normals(rng, n_simulations, width, sampling).sum(axis=1)
+                done += width
+            brownian[idx] = total * np.sqrt(self.dt)
+        return brownian
+
+    def expected_terminal(self):
+        """만기 주가의 이론적 기댓값 E[S_T] = S0 * exp(mu * T)"""
+        return self.S0 * np.exp(self.mu * self.n_steps * self.dt)
+
+    def estimate_mean(self, paths, payoff, control_variate=True, antithetic=False):
+        """
+        만기 손익(비선형 payoff) 기댓값 추정 및 표준오차
+
+        제어 변량은 E[S_T] = S0 * exp(mu * T) 를 아는 만기 주가이므로 옵션형 손익처럼
+        S_T 의 비선형 함수의 평균에만 의미가 있습니다. S_T 의 선형 함수(수익률 등)는
+        기댓값이 닫힌 해로 정해지므로 (expected_terminal) 거부합니다. VaR/CVaR 계산
+        (calculate_risk_with_error 등) 에는 사용되지 않습니다.
+
+        Parameters:
+        -----------
+        paths : np.ndarray
+            경로 행렬 또는 만기 주가 벡터
+        payoff : callable
+            만기 주가 -> 손익 함수 (예: lambda s: np.maximum(s - K, 0))
+        control_variate : bool
+            만기 주가를 제어 변량으로 사용
+        antithetic : bool
+            sampling='antithetic' 결과이면 True (쌍 평균으로 표준오차 계산)
+
+        Returns:
+        --------
+        dict
+            estimate, std_error, n_samples, variance_ratio (일반 추정 대비 분산 비율)
+
+        Raises:
+        -------
+        ValueError
+            control_variate=True 이고 payoff 가 만기 주가의 선형 함수인 경우
+        """
+        terminal = paths[:, -1] if paths.ndim == 2 else paths
+        terminal = terminal.astype(float, copy=False)
+        y = np.asarray(payoff(terminal), dtype=float)
+        x = terminal
+
+        if antithetic:
+            n_pairs = len(y) // 2
+            y = y[:2 * n_pairs].reshape(n_pairs, 2).mean(axis=1)
+            x = x[:2 * n_pairs].reshape(n_pairs, 2).mean(axis=1)
+
+        plain_var = y.var(ddof=1)
+        if control_variate:
+            x_centered = x - self.expected_terminal()
+            x_var = x_centered.var(ddof=1)
+            beta = np.cov(y, x_centered)[0, 1] / x_var if x_var > 0 else 0.0
+            y = y - beta * x_centered
+            # 잔차가 사라지면 payoff 가 S_T 의 선형 함수 (추정치는 닫힌 해, 표준오차 0)
+            if plain_var > 0 and y.var(ddof=1) <= 1e-12 * plain_var:
+                raise ValueError("payoff 가 만기 주가의 선형 함수이면 제어 변량 추정이 퇴화합니다 "
+                                 "(기댓값은 expected_terminal 로 계산).")
+
+        n = len(y)
+        y_var = y.var(ddof=1)
+        return {
+            'estimate': y.mean(),
+            'std_error': np.sqrt(y_var / n),
+            'n_samples': n,
+            'variance_ratio': y_var / plain_var if plain_var > 0 else 1.0
+        }
+
+    def calculate_risk_with_error(self, paths, confidence=0.95, n_batches=32, sampling='mc', block_size=None):
+        """
+        VaR/CVaR 와 배치 평균(batch means) 표준오차
+
+        결과를 n_batches 개 묶음으로 나누어 묶음별 VaR/CVaR 의 표준편차로 표준오차를
+        추정합니다. 묶음은 서로 독립이어야 하므로 paths 를 생성한 sampling 방식을 넘겨야 합니다.
+        - 'mc': 연속된 묶음
+        - 'antithetic': 대조 변량 쌍(행 2k, 2k+1)이 나뉘지 않도록 짝수 위치에서 분할
+        - 'sobol': simulate 의 블록(독립 스크램블) 단위 randomized QMC 추정. 크기가 같은
+          R 개 블록의 VaR/CVaR 평균을 추정치로, 표준편차 / sqrt(R) 을 표준오차로 사용
+          (크기가 다른 마지막 블록 제외, n_batches 미사용). block_size 는 simulate 에
+          넘긴 값과 같아야 합니다.
+
+        Returns:
+        --------
+        dict
+            var, cvar, var_se, cvar_se
+        """
+        returns = self._terminal_returns(paths)
+        risk = tail_risk(returns, [confidence]).iloc[0]
+        n = len(returns)
+
+        if sampling == 'sobol':
+            size = self._path_block_size(n, block_size, sampling)
+            batches = [returns[a:a + size] for a in range(0, n - size + 1, size)]
+        elif sampling == 'antithetic':
+            pairs = [p for p in np.array_split(np.arange(n // 2), n_batches) if len(p)]
+            bounds = [2 * p[0] for p in pairs] + [n]
+            batches = [returns[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        else:
+            batches = np.array_split(returns, n_batches)
+        batches = [b for b in batches if len(b) > 1]
+
+        k = len(batches)
+        if k < 2:
+            return {'var': risk['var'], 'cvar': risk['cvar'], 'var_se': np.nan, 'cvar_se': np.nan}
+
+        batch_risk = np.array([tail_risk(b, [confidence]).iloc[0][['var', 'cvar']] for b in batches], dtype=float)
+        if sampling == 'sobol':
+            # 표준오차가 독립 반복 평균에 대한 것이므로 추정치도 반복 평균 사용
+            risk = {'var': batch_risk[:, 0].mean(), 'cvar': np.nanmean(batch_risk[:, 1])}
+        return {
+            'var': risk['var'],
+            'cvar': risk['cvar'],
+            'var_se': batch_risk[:, 0].std(ddof=1) / np.sqrt(k),
+            'cvar_se': np.nanstd(batch_risk[:, 1], ddof=1) / np.sqrt(k)
+        }
+
+    def _terminal_returns(self, paths):
+        """경로 행렬 또는 만기 주가 벡터 -> 만기 수익률"""
+        final_values = paths[:, -1] if paths.ndim == 2 else paths
+        return (final_values - self.S0) / self.S0
+
+    def calculate_risk_table(self, paths, confidence_levels=DEFAULT_CONFIDENCE_LEVELS):
+        """
+        신뢰수준별 VaR/CVaR 와 꼬리 통계 (한 번의 partial selection)
+
+        Returns:
+        --------
+        pd.DataFrame
+            index 는 신뢰수준, 컬럼은 var, cvar, tail_count, tail_std, max_loss
+        """
+        return tail_risk(self._terminal_returns(paths), confidence_levels)
+
     def calculate_var(self, paths, confidence=0.95):
-        """VaR 계산"""
-        final_values = paths[:, -1]
-        initial_value = self.S0
-        returns = (final_values - initial_value) / initial_value
-        var = -np.percentile(returns, (1 - confidence) * 100)
-        return var
+        """VaR 계산 (paths: 경로 행렬 또는 만기 주가 벡터)"""
+        return self.calculate_risk_table(paths, [confidence])['var'].iloc[0]
 
     def calculate_cvar(self, paths, confidence=0.95):
-        """CVaR (Conditional VaR) 계산"""
-        final_values = paths[:, -1]
-        initial_value = self.S0
-        returns = (final_values - initial_value) / initial_value
-        var = -np.percentile(returns, (1 - confidence) * 100)
-        # VaR를 초과하는 손실의 평균
-        cvar = -returns[returns < -var].mean()
-        return cvar
+        """CVaR (Conditional VaR) 계산 (paths: 경로 행렬 또는 만기 주가 벡터)"""
+        return self.calculate_risk_table(paths, [confidence])['cvar'].iloc[0]
+
+
+class HestonSimulator(StockSimulator):
+    """
+    Heston 확률변동성 시뮬레이터 (Full truncation Euler)
+
+    dS/S = mu dt + sqrt(v) dW1,  dv = kappa (theta - v) dt + xi sqrt(v) dW2,  corr(dW1, dW2) = rho
+    경로 생성, 스트리밍, VaR/CVaR 인터페이스는 StockSimulator 와 같습니다.
+    """
+
+    def __init__(self, S0, mu, v0, kappa, theta, xi, rho, T, dt=1/252):
+        """
+        Parameters:
+        -----------
+        v0 : float
+            초기 분산 (변동성의 제곱)
+        kappa : float
+            분산 평균회귀 속도
+        theta : float
+            장기 평균 분산
+        xi : float
+            분산의 변동성 (vol of vol)
+        rho : float
+            주가-분산 충격 상관계수
+        """
+        super().__init__(S0, mu, np.sqrt(v0), T, dt)
+        self.v0 = v0
+        self.kappa = kappa
+        self.theta = theta
+        self.xi = xi
+        self.rho = rho
+
+    def _default_block_size(self):
+        # 주가/분산 두 요인의 난수를 함께 생성하므로 블록을 절반으로
+        return max(1, (1 << 21) // max(1, self.n_steps))
+
+    def _log_increments(self, rng, n, sampling='mc'):
+        """(n, n_steps) 단계별 로그수익률 (분산 경로는 시점별로 갱신, 경로 방향 벡터화)"""
+        d = self.n_steps
+        # 시점별 연산이 연속 메모리를 쓰도록 (2 * n_steps, n) 배치
+        if sampling == 'mc':
+            z = rng.standard_normal((2 * d, n))
+        else:
+            z = np.ascontiguousarray(_standard_normals(rng, n, d, sampling, factors=2).T)
+        z_v, z_s = z[:d], z[d:]
+        rho_bar = np.sqrt(1 - self.rho**2)
+
+        log_inc = np.empty((d, n))
+        v = np.full(n, float(self.v0))
+        v_pos = np.empty(n)
+        vol = np.empty(n)
+        for t in range(d):
+            np.maximum(v, 0.0, out=v_pos)
+            np.sqrt(v_pos * self.dt, out=vol)
+            log_inc[t] = (self.mu - 0.5 * v_pos) * self.dt + vol * (self.rho * z_v[t] + rho_bar * z_s[t])
+            v += self.kappa * (self.theta - v_pos) * self.dt + self.xi * vol * z_v[t]
+
+        return log_inc.T
+
+    def _terminal_log_returns(self, rng, n, sampling='mc'):
+        """닫힌 해가 없으므로 경로 블록 단위로 증분을 생성하여 합산"""
+        out = np.empty(n)
+        block = _sampling_block_size(self._default_block_size(), sampling)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            out[start:stop] = self._log_increments(rng, stop - start, sampling).sum(axis=1)
+        return out
+
+
+class MertonJumpSimulator(StockSimulator):
+    """
+    Merton 점프확산 시뮬레이터
+
+    dS/S = (mu - lam * k) dt + sigma dW + (J - 1) dN,  log J ~ N(jump_mean, jump_std^2),
+    k = E[J - 1] (점프 보정으로 E[S_T] = S0 * exp(mu * T) 유지)
+    """
+
+    def __init__(self, S0, mu, sigma, lam, jump_mean, jump_std, T, dt=1/252):
+        """
+        Parameters:
+        -----------
+        lam : float
+            연간 점프 발생 강도
+        jump_mean, jump_std : float
+            로그 점프 크기의 평균/표준편차
+        """
+        super().__init__(S0, mu, sigma, T, dt)
+        self.lam = lam
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+
+    @property
+    def _compensated_drift(self):
+        k = np.exp(self.jump_mean + 0.5 * self.jump_std**2) - 1
+        return self.mu - self.lam * k - 0.5 * self.sigma**2
+
+    def _jump_sizes(self, rng, counts):
+        """점프 횟수 배열 -> 로그 점프 합 (점프가 있는 칸만 난수 생성)"""
+        jumps = np.zeros(counts.shape)
+        hit = np.nonzero(counts)
+        n_jumps = counts[hit]
+        jumps[hit] = n_jumps * self.jump_mean + np.sqrt(n_jumps) * self.jump_std * rng.standard_normal(len(n_jumps))
+        return jumps
+
+    def _log_increments(self, rng, n, sampling='mc'):
+        """(n, n_steps) 단계별 로그수익률 (확산 + 복합 포아송 점프)"""
+        log_inc = _standard_normals(rng, n, self.n_steps, sampling)
+        log_inc *= self.sigma * np.sqrt(self.dt)
+        log_inc += self._compensated_drift * self.dt
+        log_inc += self._jump_sizes(rng, rng.poisson(self.lam * self.dt, (n, self.n_steps)))
+        return log_inc
+
+    def _terminal_log_returns(self, rng, n, sampling='mc'):
+        """만기 분포 직접 생성 (정규 확산 + 만기까지의 점프 횟수)"""
+        horizon = self.dt * self.n_steps
+        diffusion = self.sigma * np.sqrt(horizon) * _standard_normals(rng, n, 1, sampling)[:, 0]
+        jumps = self._jump_sizes(rng, rng.poisson(self.lam * horizon, n))
+        return self._compensated_drift * horizon + diffusion + jumps
+
+
+def _tail_risk_interval(smallest, n, p, z):
+    """
+    수익률 표본의 VaR/CVaR 와 오차 추정
+
+    smallest 는 전체 n 개 수익률 중 하위 값들로, VaR 신뢰구간 상단 순위까지 포함해야
+    합니다 (전체 표본을 넘겨도 됨). VaR 신뢰구간은 이항분포 정규근사로 정한
+    순서통계량 [r_(j), r_(k)] 에서, CVaR 표준오차는 std(max(L - VaR, 0)) / (p * sqrt(n))
+    (L = 손실) 로 계산하며, 초과 손실은 꼬리 밖에서 0 이므로 하위 값만으로 충분합니다.
+    """
+    spread = z * np.sqrt(n * p * (1 - p))
+    last = len(smallest) - 1
+    j = int(np.clip(np.floor(n * p - spread), 0, last))
+    k = int(np.clip(np.ceil(n * p + spread), 0, last))
+
+    risk = _tail_table(smallest, n, [1 - p], -smallest.min()).iloc[0]
+    var = risk['var']
+    cvar = risk['cvar'] if risk['tail_count'] else var
+    ordered = np.partition(smallest, [j, k])
+
+    excess = np.maximum(-smallest - var, 0.0)
+    mean = excess.sum() / n
+    variance = max((np.dot(excess, excess) - n * mean**2) / (n - 1), 0.0) if n > 1 else np.inf
+
+    return {
+        'var': var,
+        'var_lo': -ordered[k],
+        'var_hi': -ordered[j],
+        'cvar': cvar,
+        'cvar_se': np.sqrt(variance) / (p * np.sqrt(n))
+    }
+
+
+def _spawn_blocks(n_total, block_size, seed):
+    """
+    경로 구간을 (start, stop, SeedSequence) 블록으로 분할
+
+    블록 k 는 항상 SeedSequence(seed) 의 k 번째 자식 스트림을 사용하므로,
+    같은 seed 와 block_size 이면 실행 방식과 무관하게 같은 난수가 생성됩니다.
+    """
+    n_blocks = -(-n_total // block_size) if n_total > 0 else 0
+    children = np.random.SeedSequence(seed).spawn(n_blocks)
+    return [
+        (k * block_size, min((k + 1) * block_size, n_total), child)
+        for k, child in enumerate(children)
+    ]
+
+
+def _sampling_block_size(block_size, sampling):
+    """Sobol 은 균형 성질을 위해 블록 크기를 2의 거듭제곱으로, 대조 변량은 짝수로 조정"""
+    if sampling == 'sobol':
+        return 1 << max(0, int(block_size).bit_length() - 1)
+    if sampling == 'antithetic':
+        return max(2, block_size - block_size % 2)
+    if sampling != 'mc':
+        raise ValueError(f"지원하지 않는 sampling 방식입니다: {sampling}")
+    return block_size
+
+
+def _standard_normals(rng, n, d, sampling='mc', factors=1):
+    """
+    (n, factors * d) 표준정규 난수 (단계별 증분, 각 열은 N(0, 1))
+
+    열 [f * d, (f + 1) * d) 가 요인 f 의 d 단계 증분입니다.
+    sampling='sobol' 이면 스크램블 Sobol 점을 Brownian bridge 순서로 배치하여
+    앞쪽 차원(분산이 큰 성분)이 경로의 큰 움직임을 결정하도록 합니다
+    (여러 요인은 차원을 번갈아 배정).
+    """
+    if sampling == 'mc':
+        return rng.standard_normal((n, factors * d))
+
+    if sampling == 'antithetic':
+        z = rng.standard_normal(((n + 1) // 2, factors * d))
+        out = np.empty((n, factors * d))
+        out[0::2] = z
+        out[1::2] = -z[:n // 2]
+        return out
+
+    if sampling == 'sobol':
+        with warnings.catch_warnings():
+            # 2의 거듭제곱이 아닌 점 개수 경고 (마지막 블록)
+            warnings.simplefilter('ignore', UserWarning)
+            u = qmc.Sobol(factors * d, scramble=True, seed=rng).random(n)
+        z = norm.ppf(np.clip(u, 1e-12, 1 - 1e-12))
+        if d == 1:
+            return z
+        z = z.reshape(n, d, factors)
+        return np.hstack([_brownian_bridge_increments(z[:, :, f]) for f in range(factors)])
+
+    raise ValueError(f"지원하지 않는 sampling 방식입니다: {sampling}")
+
+
+@lru_cache(maxsize=32)
+def _brownian_bridge_plan(d):
+    """
+    d 단계 Brownian bridge 구성 순서
+
+    Returns:
+    --------
+    list of tuple
+        (채울 위치, 왼쪽 위치, 오른쪽 위치, 왼쪽 가중치, 오른쪽 가중치, 표준편차)
+        첫 항목은 종점 W_d (왼쪽=0, 오른쪽 없음)
+    """
+    plan = [(d, 0, None, 0.0, 0.0, np.sqrt(d))]
+    queue = [(0, d)]
+    while queue:
+        left, right = queue.pop(0)
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        plan.append((
+            mid, left, right,
+            (right - mid) / (right - left),
+            (mid - left) / (right - left),
+            np.sqrt((mid - left) * (right - mid) / (right - left))
+        ))
+        queue.extend([(left, mid), (mid, right)])
+    return plan
+
+
+def _brownian_bridge_increments(z):
+    """(n, d) 표준정규 -> Brownian bridge 경로의 단계별 증분 (각 열 N(0, 1))"""
+    n, d = z.shape
+    w = np.zeros((n, d + 1))
+    for k, (pos, left, right, wl, wr, sd) in enumerate(_brownian_bridge_plan(d)):
+        if right is None:
+            w[:, pos] = sd * z[:, k]
+        else:
+            w[:, pos] = wl * w[:, left] + wr * w[:, right] + sd * z[:, k]
+    return np.diff(w, axis=1)
+
+
+def _run_blocks(func, blocks, n_workers=1, executor='thread', *args):
+    """블록별로 func(start, stop, seed_seq, *args) 실행 (결과는 블록 순서)"""
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(blocks))
+
+    if n_workers <= 1:
+        return [func(start, stop, seed_seq, *args) for start, stop, seed_seq in blocks]
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=n_workers) as pool:
+        futures = [pool.submit(func, start, stop, seed_seq, *args) for start, stop, seed_seq in blocks]
+        return [future.result() for future in futures]
+
+
+# 국채 수익률 곡선 만기 (년), DataFetcher.get_treasury_yields 의 index 와 같음
+TENOR_YEARS = {
+    '1M': 1/12, '3M': 3/12, '6M': 6/12, '1Y': 1,
+    '2Y': 2, '3Y': 3, '5Y': 5, '7Y': 7,
+    '10Y': 10, '20Y': 20, '30Y': 30
+}
+
+
+def _annuity_moments(y, n):
+    """
+    sum_{t=1..n} t v^(t+1), sum_{t=1..n} t (t+1) v^(t+2)  (v = 1 / (1 + y))
+
+    연금 계수 a(y) = (1 - v^n) / y 의 -a'(y), a''(y) 닫힌 해. |y| < 1e-3 이면
+    닫힌 해의 상쇄 오차가 커지므로 해당 채권만 직접 합산합니다.
+    """
+    shape = np.shape(y)
+    y, n = np.atleast_1d(y), np.atleast_1d(n)
+    small = np.abs(y) < 1e-3
+    y_safe = np.where(small, 1.0, y)
+    vn = np.exp(-n * np.log1p(y_safe))
+    one_minus_vn = -np.expm1(-n * np.log1p(y_safe))
+
+    s1 = one_minus_vn / y_safe**2 - n * vn / (y_safe * (1 + y_safe))
+    s2 = (2 * one_minus_vn / y_safe**3 - 2 * n * vn / (y_safe**2 * (1 + y_safe))
+          - n * (n + 1) * vn / (y_safe * (1 + y_safe)**2))
+
+    if small.any():
+        ys, ns = y[small], n[small]
+        t = np.arange(1, int(ns.max()) + 1)[None, :]
+        v = 1 / (1 + ys[:, None])
+        mask = t <= ns[:, None]
+        s1[small] = np.where(mask, t * v**(t + 1), 0.0).sum(axis=1)
+        s2[small] = np.where(mask, t * (t + 1) * v**(t + 2), 0.0).sum(axis=1)
+
+    return s1.reshape(shape), s2.reshape(shape)
 
 
 class BondPricer:
     """채권 가격 계산기 (수익률 곡선 시뮬레이션 포함)"""
 
     @staticmethod
-    def price_bond(face_value, coupon_rate, ytm, periods, frequency=2):
-        """채권 가격 계산"""
+    def price_bonds(face_value, coupon_rate, ytm, periods, frequency=2):
+        """
+        채권 가격 일괄 계산 (연금 닫힌 해, 배열 브로드캐스팅)
+
+        P = C * (1 - (1 + y)^-n) / y + F * (1 + y)^-n  (y = ytm / frequency, y = 0 이면 C * n + F)
+
+        Parameters:
+        -----------
+        face_value, coupon_rate, ytm : float or array-like
+            액면가, 연 표면이율, 연 만기수익률 (소수)
+        periods : int or array-like
+            남은 이자 지급 횟수
+        frequency : int or array-like
+            연간 이자 지급 횟수
+
+        Returns:
+        --------
+        np.ndarray or float
+            입력을 브로드캐스팅한 모양의 채권 가격 (모두 스칼라이면 float)
+        """
+        face_value, coupon_rate, ytm, periods, frequency = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (face_value, coupon_rate, ytm, periods, frequency))
+        )
         coupon = face_value * coupon_rate / frequency
-        discount_rate = ytm / frequency
+        y = ytm / frequency
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            discount = np.exp(-periods * np.log1p(y))
+            annuity = np.where(y == 0, periods, -np.expm1(-periods * np.log1p(y)) / y)
 
-        pv_coupons = sum([coupon / (1 + discount_rate)**t for t in range(1, periods + 1)])
-        pv_principal = face_value / (1 + discount_rate)**periods
+        price = coupon * annuity + face_value * discount
+        return price[()] if price.ndim == 0 else price
 
-        return pv_coupons + pv_principal
+    @staticmethod
+    def price_bond(face_value, coupon_rate, ytm, periods, frequency=2):
+        """채권 가격 계산"""
+        return float(BondPricer.price_bonds(face_value, coupon_rate, ytm, periods, frequency))
 
     @staticmethod
     def duration(face_value, coupon_rate, ytm, periods, frequency=2):
         """듀레이션 계산"""
+        risk = BondPricer.bond_risk(face_value, coupon_rate, ytm, periods, frequency)
+        return float(risk['macaulay_duration'])
+
+    @staticmethod
+    def bond_risk(face_value, coupon_rate, ytm, periods, frequency=2):
+        """
+        채권 민감도 일괄 계산 (닫힌 해, 배열 브로드캐스팅)
+
+        기간 수익률 y 에 대한 연금 계수 a(y) = (1 - v^n) / y (v = 1 / (1 + y)) 의
+        1, 2차 도함수로 sum t v^(t+1), sum t (t+1) v^(t+2) 를 구해 현금흐름 반복 없이
+        계산합니다 (|y| 가 매우 작은 채권만 직접 합산).
+
+        Returns:
+        --------
+        dict
+            price, macaulay_duration (년), modified_duration, convexity (연 수익률 기준),
+            dv01 (수익률 1bp 하락 시 가격 상승분)
+        """
+        face_value, coupon_rate, ytm, periods, frequency = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (face_value, coupon_rate, ytm, periods, frequency))
+        )
         coupon = face_value * coupon_rate / frequency
-        discount_rate = ytm / frequency
+        y = ytm / frequency
+        discount = np.exp(-periods * np.log1p(y))
 
-        price = BondPricer.price_bond(face_value, coupon_rate, ytm, periods, frequency)
+        s1, s2 = _annuity_moments(y, periods)
+        price = BondPricer.price_bonds(face_value, coupon_rate, ytm, periods, frequency)
+        # -dP/dy, d2P/dy2 (기간 수익률 기준)
+        slope = coupon * s1 + periods * face_value * discount / (1 + y)
+        curvature = coupon * s2 + periods * (periods + 1) * face_value * discount / (1 + y)**2
 
-        weighted_cf = 0
-        for t in range(1, periods + 1):
-            if t < periods:
-                cf = coupon
-            else:
-                cf = coupon + face_value
-            weighted_cf += (t / frequency) * cf / (1 + discount_rate)**t
+        modified = slope / (price * frequency)
+        result = {
+            'price': price,
+            'macaulay_duration': modified * (1 + y),
+            'modified_duration': modified,
+            'convexity': curvature / (price * frequency**2),
+            'dv01': modified * price * 1e-4
+        }
+        return {k: v[()] if np.ndim(v) == 0 else v for k, v in result.items()}
+
+    @staticmethod
+    def yield_to_maturity(price, face_value, coupon_rate, periods, frequency=2, tol=1e-10, max_iter=100):
+        """
+        시장 가격 -> 만기수익률 일괄 계산 (벡터화 Newton-Raphson + 이분법 보정)
+
+        모든 채권을 동시에 Newton 으로 갱신하면서 가격의 단조성으로 구간 [lo, hi] 를
+        유지하고, Newton 단계가 구간을 벗어나면 해당 채권만 이분법으로 대체합니다.
+        수렴한 채권은 다음 반복에서 제외합니다.
+
+        Parameters:
+        -----------
+        price : float or array-like
+            시장 가격 (clean price, 액면가와 같은 단위)
+        face_value, coupon_rate, periods, frequency : float or array-like
+            price_bonds 와 같음
+        tol : float
+            가격 상대 오차 허용치
+        max_iter : int
+            최대 반복 횟수
+
+        Returns:
+        --------
+        dict
+            ytm (연 수익률, 소수), iterations (채권별 반복 횟수), converged (bool)
+        """
+        inputs = (price, face_value, coupon_rate, periods, frequency)
+        scalar = all(np.ndim(x) == 0 for x in inputs)
+        price, face_value, coupon_rate, periods, frequency = (
+            np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in inputs))
+        )
+        n = len(price)
+        valid = (price > 0) & (face_value > 0) & (periods >= 1)
 
-        return weighted_cf / price
+        # 근사 YTM 으로 시작, 구간은 기간 수익률 (-1, 10] 에 해당하는 연 수익률
+        coupon = face_value * coupon_rate
+        guess = (coupon + (face_value - price) / np.maximum(periods / frequency, 1e-12)) / ((face_value + price) / 2)
+        lo = -0.999 * frequency
+        hi = 10.0 * frequency
+        ytm = np.clip(np.where(valid, guess, np.nan), lo * 0.5, hi * 0.5)
+
+        iterations = np.zeros(n, dtype=np.int64)
+        converged = np.zeros(n, dtype=bool)
+        active = np.flatnonzero(valid)
+
+        for _ in range(max_iter):
+            if len(active) == 0:
+                break
+            risk = BondPricer.bond_risk(face_value[active], coupon_rate[active], ytm[active],
+                                        periods[active], frequency[active])
+            error = np.atleast_1d(risk['price']) - price[active]
+            slope = -np.atleast_1d(risk['modified_duration']) * np.atleast_1d(risk['price'])
+            iterations[active] += 1
+
+            done = np.abs(error) <= tol * price[active]
+            converged[active[done]] = True
+
+            # 가격이 높으면 수익률이 낮은 것 (가격은 수익률에 대해 감소)
+            too_low = error > 0
+            lo[active] = np.where(too_low, ytm[active], lo[active])
+            hi[active] = np.where(too_low, hi[active], ytm[active])
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = ytm[active] - error / slope
+            inside = np.isfinite(step) & (step > lo[active]) & (step < hi[active])
+            new = np.where(inside, step, 0.5 * (lo[active] + hi[active]))
+
+            # 구간 끝으로 몰리는 이분법 축소는 수렴으로 보지 않음 (Newton 단계만 인정)
+            small_step = inside & (np.abs(new - ytm[active]) <= tol * np.maximum(1.0, np.abs(ytm[active])))
+            converged[active[small_step & ~done]] = True
+            ytm[active] = np.where(done, ytm[active], new)
+            active = active[~(done | small_step)]
+
+        result = {'ytm': ytm, 'iterations': iterations, 'converged': converged}
+        return {k: v[0] for k, v in result.items()} if scalar else result
+
+    @staticmethod
+    def key_rate_durations(face_value, coupon_rate, ytm, periods, frequency=2, tenors=None):
+        """
+        Key rate duration (국채 만기별 삼각형 충격 기준)
+
+        현금흐름 시점 격자(연간 지급 횟수의 최소공배수 간격)에 대한 채권별
+        PV * t / ((1 + y) * P) 행렬과 만기별 삼각형 가중치 행렬을 한 번 곱해 계산합니다.
+        가중치는 각 시점에서 합이 1 이므로 만기별 값의 합은 수정 듀레이션과 같습니다.
+
+        Parameters:
+        -----------
+        tenors : dict, optional
+            {만기 라벨: 년} (기본값은 get_treasury_yields 의 만기 TENOR_YEARS)
+
+        Returns:
+        --------
+        pd.DataFrame
+            (채권 수, 만기 수) key rate duration
+        """
+        tenors = TENOR_YEARS if tenors is None else tenors
+        face_value, coupon_rate, ytm, periods, frequency = (
+            np.atleast_1d(a) for a in np.broadcast_arrays(
+                *(np.asarray(x, dtype=float) for x in (face_value, coupon_rate, ytm, periods, frequency))
+            )
+        )
+        coupon = face_value * coupon_rate / frequency
+        y = ytm / frequency
+        price = BondPricer.price_bonds(face_value, coupon_rate, ytm, periods, frequency)
+
+        # 모든 지급 시점을 포함하는 공통 시간 격자 (1 / lcm(frequency) 년 간격)
+        grid_per_year = int(np.lcm.reduce(np.unique(frequency).astype(np.int64)))
+        step = (grid_per_year / frequency)[:, None]
+        k = np.arange(1, int((periods * step[:, 0]).max()) + 1)[None, :]
+        j = k / step
+        paid = (k % step == 0) & (j <= periods[:, None])
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            pv = np.where(paid, coupon[:, None] * np.exp(-j * np.log1p(y)[:, None]), 0.0)
+            pv += np.where(paid & (j == periods[:, None]), face_value[:, None] * np.exp(-j * np.log1p(y)[:, None]), 0.0)
+        times = k[0] / grid_per_year
+        exposure = pv * times / ((1 + y) * price)[:, None]
+
+        tenor_years = np.array(list(tenors.values()), dtype=float)
+        weights = np.column_stack([np.interp(times, tenor_years, e) for e in np.eye(len(tenor_years))])
+        return pd.DataFrame(exposure @ weights, columns=list(tenors))
 
     @staticmethod
     def simulate_yield_curve_shift(base_yields, shift_type='parallel', magnitude=0.01):
@@ -101,13 +1137,12 @@ class BondPricer:
         --------
         pd.Series
             변화된 수익률 곡선
-        """
-        maturities_months = {
-            '1M': 1/12, '3M': 3/12, '6M': 6/12, '1Y': 1,
-            '2Y': 2, '3Y': 3, '5Y': 5, '7Y': 7,
-            '10Y': 10, '20Y': 20, '30Y': 30
-        }
 
+        Raises:
+        -------
+        ValueError
+            해석할 수 없는 만기 라벨 (예전에는 10년으로 간주)
+        """
         shifted_yields = base_yields.copy()
 
         if shift_type == 'parallel':
@@ -117,14 +1152,14 @@ class BondPricer:
         elif shift_type == 'steepening':
             # 장기 금리가 더 많이 상승 (급경사화)
             for maturity in shifted_yields.index:
-                years = maturities_months.get(maturity, 10)
+                years = parse_tenor(maturity)
                 shift = magnitude * (years / 30)  # 30년 기준 정규화
                 shifted_yields[maturity] += shift
 
         elif shift_type == 'flattening':
             # 단기 금리가 더 많이 상승 (평탄화)
             for maturity in shifted_yields.index:
-                years = maturities_months.get(maturity, 10)
+                years = parse_tenor(maturity)
                 shift = magnitude * (1 - years / 30)
                 shifted_yields[maturity] += shift
 
@@ -329,3 +1364,38 @@ class InterestRateSwap:
             })
 
         return pd.DataFrame(cashflows)
+
+    @staticmethod
+    def price_on_curve(notional, fixed_rate, periods, curve):
+        """
+        적합된 수익률 곡선 기준 IRS 평가 (연 1회 지급, calculate_cashflows 와 같은 기간)
+
+        변동금리는 곡선의 연 단위 내재 선도금리 DF(t-1) / DF(t) - 1 로 두고,
+        기간별 순지급액(고정 - 변동)을 곡선 할인계수로 할인합니다.
+
+        Parameters:
+        -----------
+        notional : float
+            명목원금
+        fixed_rate : float
+            고정금리 (연율)
+        periods : int
+            지급 횟수 (년)
+        curve : YieldCurve
+            적합된 zero 곡선
+
+        Returns:
+        --------
+        dict
+            forward_rates (기간별 내재 선도금리), discount (할인계수),
+            par_rate (현재가치 0 인 고정금리), pv (순지급액 현재가치)
+        """
+        times = np.arange(1, periods + 1, dtype=float)
+        discount = curve.discount(times)
+        forward_rates = np.concatenate([[1.0], discount[:-1]]) / discount - 1
+        return {
+            'forward_rates': forward_rates,
+            'discount': discount,
+            'par_rate': (1 - discount[-1]) / discount.sum(),
+            'pv': notional * ((fixed_rate - forward_rates) * discount).sum()
+        }
@@ -0,0 +1,109 @@
+"""
+시뮬레이션 경로 요약 모듈 (시점별 분위수 밴드)
+"""
+
+import numpy as np
+import pandas as pd
+
+# 팬 차트 기본 분위수 (%)
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _band_columns(percentiles):
+    return [f"p{q:g}" for q in percentiles]
+
+
+def summarize_paths(paths, percentiles=FAN_PERCENTILES):
+    """
+    경로 행렬의 시점별 분위수와 평균 (한 번의 벡터화 계산)
+
+    Parameters:
+    -----------
+    paths : np.ndarray
+        (n_simulations, n_steps + 1) 경로
+    percentiles : sequence of float
+        분위수 (%)
+
+    Returns:
+    --------
+    pd.DataFrame
+        index 는 시점(step), 컬럼은 'p5', 'p25', ... 와 'mean'
+    """
+    bands = np.percentile(paths, percentiles, axis=0)
+    summary = pd.DataFrame(bands.T, columns=_band_columns(percentiles))
+    summary['mean'] = paths.mean(axis=0)
+    summary.index.name = 'step'
+    return summary
+
+
+class PathFanAccumulator:
+    """
+    블록 단위로 들어오는 경로의 시점별 분위수 근사 (스트리밍)
+
+    첫 블록의 시점별 로그가격 범위를 양쪽으로 넓혀 고정 히스토그램 구간을 정하고,
+    이후 블록은 구간별 개수만 누적합니다 (범위 밖 값은 양 끝 구간에 포함).
+    메모리는 경로 수와 무관하게 (n_steps + 1) * n_bins 입니다.
+    """
+
+    def __init__(self, n_points, percentiles=FAN_PERCENTILES, n_bins=1024, margin=0.5):
+        """
+        Parameters:
+        -----------
+        n_points : int
+            경로 길이 (n_steps + 1)
+        n_bins : int
+            시점별 히스토그램 구간 수 (분위수 오차는 구간 폭 이내)
+        margin : float
+            첫 블록 범위 대비 양쪽 여유 비율
+        """
+        self.n_points = n_points
+        self.percentiles = tuple(percentiles)
+        self.n_bins = n_bins
+        self.margin = margin
+        self.count = 0
+        self._counts = np.zeros(n_points * n_bins, dtype=np.int64)
+        self._sum = np.zeros(n_points)
+        self._lo = None
+        self._width = None
+
+    def update(self, block):
+        """(m, n_points) 경로 블록 반영"""
+        log_block = np.log(block)
+        if self._lo is None:
+            lo = log_block.min(axis=0)
+            hi = log_block.max(axis=0)
+            pad = (hi - lo) * self.margin
+            self._lo = lo - pad
+            self._width = np.maximum((hi - lo + 2 * pad) / self.n_bins, 1e-12)
+
+        idx = np.floor((log_block - self._lo) / self._width).astype(np.int64)
+        np.clip(idx, 0, self.n_bins - 1, out=idx)
+        idx += np.arange(self.n_points) * self.n_bins
+        self._counts += np.bincount(idx.ravel(), minlength=len(self._counts))
+
+        self._sum += block.sum(axis=0)
+        self.count += block.shape[0]
+
+    def result(self):
+        """
+        Returns:
+        --------
+        pd.DataFrame
+            summarize_paths 와 같은 형식의 시점별 분위수와 평균
+        """
+        counts = self._counts.reshape(self.n_points, self.n_bins)
+        cdf = np.cumsum(counts, axis=1)
+        steps = np.arange(self.n_points)
+
+        bands = {}
+        for q, column in zip(self.percentiles, _band_columns(self.percentiles)):
+            target = q / 100 * self.count
+            b = np.minimum((cdf < target).sum(axis=1), self.n_bins - 1)
+            before = np.where(b > 0, cdf[steps, np.maximum(b - 1, 0)], 0)
+            frac = np.clip((target - before) / np.maximum(counts[steps, b], 1), 0.0, 1.0)
+            bands[column] = np.exp(self._lo + (b + frac) * self._width)
+
+        summary = pd.DataFrame(bands)
+        summary['mean'] = self._sum / max(self.count, 1)
+        summary.index.name = 'step'
+        return summary
@@ -6,6 +6,8 @@ import numpy as np
 import pandas as pd
 from scipy.stats import norm
 
+from .risk import DEFAULT_CONFIDENCE_LEVELS, tail_risk
+
 class PortfolioSimulator:
     """포트폴리오 시뮬레이터 (고급)"""
 
@@ -55,30 +57,35 @@ class PortfolioSimulator:
         sortino_ratio = excess_return / downside_std if downside_std > 0 else 0
         return sortino_ratio
 
-    def efficient_frontier(self, n_portfolios=10000):
-        """효율적 투자선 계산"""
-        np.random.seed(42)
+    def efficient_frontier(self, n_portfolios=10000, seed=42):
+        """
+        효율적 투자선 계산
 
-        results = np.zeros((4, n_portfolios))
-        all_weights = []
+        전역 난수 상태를 건드리지 않도록 seed 별 독립 Generator 를 사용하며,
+        모든 무작위 포트폴리오를 한 번의 행렬 연산으로 평가합니다.
+        """
+        rng = np.random.default_rng(seed)
 
-        for i in range(n_portfolios):
-            weights = np.random.random(self.n_assets)
-            weights /= np.sum(weights)
-            all_weights.append(weights)
+        weights = rng.random((n_portfolios, self.n_assets))
+        weights /= weights.sum(axis=1, keepdims=True)
 
-            portfolio_return = np.sum(self.returns.mean() * weights) * 252
-            cov_matrix = self.returns.cov() * 252
-            portfolio_std = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-            sharpe_ratio = portfolio_return / portfolio_std if portfolio_std > 0 else 0
+        mean_returns = self.returns.mean().to_numpy() * 252
+        cov_matrix = self.returns.cov().to_numpy() * 252
 
-            results[0,i] = portfolio_return
-            results[1,i] = portfolio_std
-            results[2,i] = sharpe_ratio
-            results[3,i] = i
+        portfolio_return = weights @ mean_returns
+        portfolio_std = np.sqrt(np.einsum('ij,jk,ik->i', weights, cov_matrix, weights))
+        sharpe_ratio = np.divide(
+            portfolio_return, portfolio_std,
+            out=np.zeros(n_portfolios), where=portfolio_std > 0
+        )
 
-        results_df = pd.DataFrame(results.T, columns=['return', 'volatility', 'sharpe', 'index'])
-        results_df['weights'] = all_weights
+        results_df = pd.DataFrame({
+            'return': portfolio_return,
+            'volatility': portfolio_std,
+            'sharpe': sharpe_ratio,
+            'index': np.arange(n_portfolios, dtype=float)
+        })
+        results_df['weights'] = list(weights)
 
         return results_df
 
@@ -100,12 +107,24 @@ class PortfolioSimulator:
             'sharpe_ratio': optimal['sharpe']
         }
 
+    def calculate_risk_table(self, confidence_levels=DEFAULT_CONFIDENCE_LEVELS):
+        """
+        신뢰수준별 역사적 VaR/CVaR 와 꼬리 통계 (포트폴리오 수익률 1회 계산)
+
+        Returns:
+        --------
+        pd.DataFrame
+            index 는 신뢰수준, 컬럼은 var, cvar, tail_count, tail_std, max_loss
+        """
+        portfolio_returns = (self.returns * self.weights).sum(axis=1)
+        return tail_risk(portfolio_returns, confidence_levels)
+
     def calculate_var(self, confidence=0.95, method='historical'):
         """포트폴리오 VaR 계산"""
         portfolio_returns = (self.returns * self.weights).sum(axis=1)
 
         if method == 'historical':
-            var = -np.percentile(portfolio_returns, (1 - confidence) * 100)
+            var = tail_risk(portfolio_returns, [confidence])['var'].iloc[0]
         else:
             mean = portfolio_returns.mean()
             std = portfolio_returns.std()
@@ -122,12 +141,7 @@ class PortfolioSimulator:
         float
             CVaR 값
         """
-        portfolio_returns = (self.returns * self.weights).sum(axis=1)
-        var = -np.percentile(portfolio_returns, (1 - confidence) * 100)
-
-        # VaR를 초과하는 손실의 평균
-        cvar = -portfolio_returns[portfolio_returns < -var].mean()
-        return cvar
+        return self.calculate_risk_table([confidence])['cvar'].iloc[0]
 
     def stress_test(self, scenario_name, shock_magnitudes):
         """
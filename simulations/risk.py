@@ -0,0 +1,131 @@
+"""
+손익 분포 위험 측정 모듈 (여러 신뢰수준 VaR/CVaR 를 한 번에 계산)
+"""
+
+import numpy as np
+import pandas as pd
+
+# 위험 패널 기본 신뢰수준
+DEFAULT_CONFIDENCE_LEVELS = (0.90, 0.95, 0.99, 0.995)
+
+RISK_COLUMNS = ['var', 'cvar', 'tail_count', 'tail_std', 'max_loss']
+
+
+def _quantile_positions(n, confidence_levels):
+    """np.percentile(linear) 과 같은 분위수 위치 (하단 순위, 보간 비율)"""
+    h = (n - 1) * (1 - np.asarray(confidence_levels, dtype=float))
+    lower = np.floor(h).astype(np.int64)
+    return lower, h - lower
+
+
+def _tail_table(smallest, n, confidence_levels, max_loss):
+    """
+    smallest 에 전체 n 개 수익률 중 가장 작은 값들이 충분히 포함되어 있을 때의 위험 표
+
+    분위수에 필요한 순위(하단/상단)만 np.partition 으로 한 번에 선택하고,
+    각 신뢰수준의 CVaR 은 하단 순위 앞쪽 구간(꼬리)만 사용합니다.
+    """
+    lower, frac = _quantile_positions(n, confidence_levels)
+    upper = np.minimum(lower + 1, n - 1)
+    kth = np.unique(np.concatenate([lower, upper]))
+    ordered = np.partition(smallest, kth)
+
+    rows = []
+    for lo, hi, w in zip(lower, upper, frac):
+        q = ordered[lo] + w * (ordered[hi] - ordered[lo])
+        tail = ordered[:lo + 1]
+        tail = tail[tail < q]
+        rows.append({
+            'var': -q,
+            'cvar': -tail.mean() if len(tail) else np.nan,
+            'tail_count': len(tail),
+            'tail_std': tail.std(ddof=1) if len(tail) > 1 else np.nan,
+            'max_loss': max_loss
+        })
+
+    table = pd.DataFrame(rows, index=pd.Index(confidence_levels, name='confidence'), columns=RISK_COLUMNS)
+    return table
+
+
+def tail_risk(returns, confidence_levels=DEFAULT_CONFIDENCE_LEVELS):
+    """
+    수익률(손익) 표본의 신뢰수준별 VaR/CVaR 와 꼬리 통계
+
+    VaR 는 np.percentile 과, CVaR 는 VaR 를 초과하는 손실의 평균과 같은 정의이며
+    전체 정렬 없이 partial selection 한 번으로 계산합니다.
+
+    Parameters:
+    -----------
+    returns : array-like
+        수익률 또는 손익 (손실이 음수)
+    confidence_levels : sequence of float
+        신뢰수준 목록 (예: 0.95)
+
+    Returns:
+    --------
+    pd.DataFrame
+        index 는 신뢰수준, 컬럼은 var, cvar, tail_count, tail_std, max_loss
+        (손실을 양수로 표시)
+    """
+    values = np.asarray(returns, dtype=float).ravel()
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return pd.DataFrame(np.nan, index=pd.Index(confidence_levels, name='confidence'), columns=RISK_COLUMNS)
+
+    return _tail_table(values, len(values), confidence_levels, -values.min())
+
+
+class TailRiskAccumulator:
+    """
+    블록 단위로 들어오는 수익률의 VaR/CVaR (스트리밍)
+
+    전체 표본 수 n_total 을 알면 가장 낮은 신뢰수준의 분위수까지 필요한
+    하위 k 개 수익률만 보관하면 되므로, 메모리는 n_total * (1 - 최저 신뢰수준) 정도입니다.
+    """
+
+    def __init__(self, n_total, confidence_levels=DEFAULT_CONFIDENCE_LEVELS):
+        """
+        Parameters:
+        -----------
+        n_total : int
+            반영할 전체 수익률 개수 (상한)
+        confidence_levels : sequence of float
+            신뢰수준 목록
+        """
+        self.n_total = n_total
+        self.confidence_levels = tuple(confidence_levels)
+        lower, _ = _quantile_positions(n_total, self.confidence_levels)
+        self.keep = int(lower.max()) + 2
+        self.count = 0
+        self.total = 0.0
+        self._smallest = np.empty(0)
+
+    def update(self, returns):
+        """수익률 블록 반영"""
+        values = np.asarray(returns, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if self.count + len(values) > self.n_total:
+            raise ValueError(f"n_total({self.n_total}) 보다 많은 수익률이 입력되었습니다.")
+
+        self.count += len(values)
+        self.total += values.sum()
+
+        merged = np.concatenate([self._smallest, values])
+        if len(merged) > self.keep:
+            merged = np.partition(merged, self.keep - 1)[:self.keep]
+        self._smallest = merged
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def result(self):
+        """
+        Returns:
+        --------
+        pd.DataFrame
+            tail_risk 와 같은 형식의 위험 표
+        """
+        if self.count == 0:
+            return tail_risk([], self.confidence_levels)
+        return _tail_table(self._smallest, self.count, self.confidence_levels, -self._smallest.min())
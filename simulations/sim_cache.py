@@ -0,0 +1,147 @@
+"""
+시뮬레이션 결과 캐시 모듈 (파라미터 키 LRU, 만기 연장 시 증분 생성)
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .individual_products import StockSimulator
+
+# 시간 구간 길이 (거래일 기준 약 1개월)
+SEGMENT_STEPS = 21
+
+
+class SimulationCache:
+    """
+    주가 경로 캐시
+
+    GBM(StockSimulator) 일반 Monte Carlo 경로는 (S0, mu, sigma, dt, seed, n_simulations)
+    로 저장하고, 시간 구간 k 의 난수를 SeedSequence(seed, spawn_key=(k,)) 스트림에서
+    생성합니다. 따라서 만기만 늘어나면 뒤쪽 구간만 이어서 생성하며, 그 결과는 긴
+    만기로 처음부터 생성한 경로와 같습니다 (simulate 의 경로 블록 난수 배치와는
+    다릅니다). 그 밖의 모형/샘플링 방식은 만기를 포함한 전체 파라미터로 그대로
+    저장합니다. 전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터
+    제거합니다.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, segment_steps=SEGMENT_STEPS):
+        """
+        Parameters:
+        -----------
+        max_bytes : int
+            캐시 전체 최대 크기 (바이트)
+        segment_steps : int
+            난수 스트림을 나누는 시간 구간 길이 (단계 수)
+        """
+        self.max_bytes = max_bytes
+        self.segment_steps = segment_steps
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(['hits', 'extensions', 'misses', 'evictions'], 0)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(paths.nbytes for paths in self._entries.values())
+
+    def get_paths(self, simulator, n_simulations=1000, seed=42, sampling='mc'):
+        """
+        simulator 파라미터에 해당하는 (n_simulations, n_steps + 1) 경로
+
+        반환 배열은 캐시와 메모리를 공유하는 읽기 전용 배열입니다.
+        """
+        if type(simulator) is StockSimulator and sampling == 'mc':
+            key = ('gbm', float(simulator.S0), float(simulator.mu), float(simulator.sigma),
+                   float(simulator.dt), seed, n_simulations)
+            return self._get_extendable(key, simulator, n_simulations, seed)
+
+        params = tuple(sorted((k, float(v)) for k, v in vars(simulator).items()))
+        key = (type(simulator).__name__, params, seed, n_simulations, sampling)
+        with self._lock:
+            paths = self._lookup(key)
+        if paths is not None:
+            return paths
+
+        paths = simulator.simulate(n_simulations, seed=seed, sampling=sampling)
+        paths.setflags(write=False)
+        with self._lock:
+            self.stats['misses'] += 1
+            self._insert(key, paths)
+        return paths
+
+    def _lookup(self, key):
+        paths = self._entries.get(key)
+        if paths is not None:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        return paths
+
+    def _get_extendable(self, key, simulator, n_simulations, seed):
+        n_steps = simulator.n_steps
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached.shape[1] > n_steps:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached[:, :n_steps + 1]
+
+        # 필요한 구간 수만큼 배열 확보 후 부족한 구간만 생성
+        n_segments = -(-n_steps // self.segment_steps)
+        paths = np.empty((n_simulations, n_segments * self.segment_steps + 1))
+        done = 0
+        if cached is not None:
+            done = (cached.shape[1] - 1) // self.segment_steps
+            paths[:, :cached.shape[1]] = cached
+        else:
+            paths[:, 0] = simulator.S0
+
+        for k in range(done, n_segments):
+            self._fill_segment(simulator, paths, k, seed)
+        paths.setflags(write=False)
+
+        with self._lock:
+            self.stats['extensions' if cached is not None else 'misses'] += 1
+            self._insert(key, paths)
+        return paths[:, :n_steps + 1]
+
+    def _fill_segment(self, simulator, paths, k, seed):
+        """시간 구간 k 의 경로 (구간마다 독립 난수 스트림)"""
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(k,)))
+        start = k * self.segment_steps
+        stop = start + self.segment_steps
+
+        log_inc = rng.standard_normal((paths.shape[0], self.segment_steps))
+        log_inc *= simulator.sigma * np.sqrt(simulator.dt)
+        log_inc += (simulator.mu - 0.5 * simulator.sigma**2) * simulator.dt
+        np.cumsum(log_inc, axis=1, out=log_inc)
+        log_inc += np.log(paths[:, start])[:, None]
+        np.exp(log_inc, out=paths[:, start + 1:stop + 1])
+
+    def _insert(self, key, paths):
+        self._entries[key] = paths
+        self._entries.move_to_end(key)
+
+        total = sum(p.nbytes for p in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.nbytes
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_simulation_cache():
+    """프로세스 전체에서 공유하는 SimulationCache"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SimulationCache()
+        return _shared_cache
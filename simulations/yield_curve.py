@@ -0,0 +1,223 @@
+"""
+수익률 곡선 모듈 (Nelson-Siegel-Svensson / 단조 스플라인 적합, 할인계수)
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import PchipInterpolator
+
+_TENOR_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([DWMY])\s*$', re.IGNORECASE)
+_TENOR_UNIT_YEARS = {'D': 1 / 365, 'W': 7 / 365, 'M': 1 / 12, 'Y': 1.0}
+
+
+def parse_tenor(label):
+    """
+    만기 라벨 -> 년 ('1M' -> 1/12, '10Y' -> 10, '2W', '30D' 지원)
+
+    Raises:
+    -------
+    ValueError
+        해석할 수 없는 라벨
+    """
+    if isinstance(label, (int, float, np.integer, np.floating)):
+        return float(label)
+
+    match = _TENOR_PATTERN.match(str(label))
+    if match is None:
+        raise ValueError(f"만기 라벨을 해석할 수 없습니다: {label!r}")
+    return float(match.group(1)) * _TENOR_UNIT_YEARS[match.group(2).upper()]
+
+
+def bootstrap_par_curve(tenors, par_yields, frequency=2):
+    """
+    이표채 par 수익률 곡선 -> 연속복리 zero 금리 (부트스트래핑)
+
+    1 / frequency 년 이하 만기(단기 국채)는 frequency 회 복리 zero 금리로 보고,
+    그보다 긴 구간은 이표 지급 시점마다 par 수익률을 선형 보간하여 각 시점의
+    par 채권 가격이 액면가가 되도록 할인계수를 차례로 구합니다.
+
+    Parameters:
+    -----------
+    tenors : array-like
+        관측 만기 (년)
+    par_yields : array-like
+        관측 par 수익률 (소수, frequency 회 복리, NaN 은 제외)
+    frequency : int
+        연간 이자 지급 횟수 (미국 국채는 2)
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (만기, 연속복리 zero 금리), 단기 관측 만기와 이표 지급 시점 격자
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    par_yields = np.asarray(par_yields, dtype=float)
+    valid = ~np.isnan(par_yields)
+    order = np.argsort(tenors[valid])
+    tenors, par_yields = tenors[valid][order], par_yields[valid][order]
+
+    step = 1.0 / frequency
+    short = tenors < step - 1e-9
+    short_times = tenors[short]
+    short_zero = frequency * np.log1p(par_yields[short] / frequency)
+
+    n = int(np.floor(tenors[-1] * frequency + 1e-9))
+    if n < 1:
+        return short_times, short_zero
+
+    times = np.arange(1, n + 1) * step
+    coupons = np.interp(times, tenors, par_yields) / frequency
+    discount = np.empty(n)
+    annuity = 0.0
+    for i in range(n):
+        discount[i] = (1.0 - coupons[i] * annuity) / (1.0 + coupons[i])
+        annuity += discount[i]
+
+    return np.concatenate([short_times, times]), np.concatenate([short_zero, -np.log(discount) / times])
+
+
+def _nss_loadings(t, tau1, tau2):
+    """(len(t), 4) Nelson-Siegel-Svensson 요인 적재값"""
+    t = np.maximum(np.asarray(t, dtype=float), 1e-8)
+    x1, x2 = t / tau1, t / tau2
+    slope = -np.expm1(-x1) / x1
+    return np.column_stack([
+        np.ones_like(t),
+        slope,
+        slope - np.exp(-x1),
+        -np.expm1(-x2) / x2 - np.exp(-x2)
+    ])
+
+
+class YieldCurve:
+    """
+    무이표(zero) 수익률 곡선
+
+    관측 수익률(compounding 회 복리)을 연속복리 zero 금리로 변환한 뒤 한 번 적합하고,
+    zero / discount / forward 를 배열 단위로 계산합니다. 자주 쓰는 시간 격자의
+    할인계수는 discount_grid 로 메모이즈됩니다.
+    - method='nss': Nelson-Siegel-Svensson (감쇠 계수 격자 탐색 + 선형 최소제곱)
+    - method='pchip': 단조 보존 3차 스플라인 (관측 만기 밖은 끝 값 유지)
+    """
+
+    def __init__(self, tenors, yields, method='nss', compounding=2):
+        """
+        Parameters:
+        -----------
+        tenors : array-like
+            관측 만기 (년)
+        yields : array-like
+            관측 수익률 (소수)
+        method : str
+            'nss' 또는 'pchip'
+        compounding : int or None
+            관측 수익률의 연 복리 횟수 (None 이면 연속복리)
+        """
+        tenors = np.asarray(tenors, dtype=float)
+        yields = np.asarray(yields, dtype=float)
+        valid = ~np.isnan(yields)
+        order = np.argsort(tenors[valid])
+        self.tenors = tenors[valid][order]
+        self.yields = yields[valid][order]
+        if len(self.tenors) < 2:
+            raise ValueError("수익률 곡선 적합에는 최소 2개 만기가 필요합니다.")
+
+        self.method = method
+        self.compounding = compounding
+        zero = self.yields if compounding is None else compounding * np.log1p(self.yields / compounding)
+
+        if method == 'nss':
+            self.params = self._fit_nss(self.tenors, zero)
+        elif method == 'pchip':
+            self._spline = PchipInterpolator(self.tenors, zero, extrapolate=False)
+        else:
+            raise ValueError(f"지원하지 않는 곡선 적합 방식입니다: {method}")
+
+        self._grids = {}
+        self._grid_lock = threading.Lock()
+
+    @classmethod
+    def from_par_yields(cls, tenors, par_yields, method='nss', frequency=2):
+        """이표채 par 수익률로 곡선 생성 (bootstrap_par_curve 로 zero 금리 변환 후 적합)"""
+        times, zero = bootstrap_par_curve(tenors, par_yields, frequency)
+        return cls(times, zero, method, compounding=None)
+
+    @classmethod
+    def from_treasury_yields(cls, yields, method='nss', frequency=2):
+        """
+        DataFetcher.get_treasury_yields 결과(만기 라벨 index, % 단위)로 곡선 생성
+
+        국채 CMT 수익률은 반기 이표채의 par 수익률이므로 zero 금리로 부트스트래핑한
+        뒤 적합합니다.
+
+        Raises:
+        -------
+        ValueError
+            해석할 수 없는 만기 라벨
+        """
+        yields = pd.Series(yields).dropna()
+        tenors = [parse_tenor(label) for label in yields.index]
+        return cls.from_par_yields(tenors, yields.to_numpy(dtype=float) / 100, method, frequency)
+
+    @staticmethod
+    def _fit_nss(tenors, zero, n_grid=30):
+        """감쇠 계수 (tau1 < tau2) 격자마다 beta 를 최소제곱으로 풀어 오차가 가장 작은 조합 선택"""
+        taus = np.geomspace(0.1, 30, n_grid)
+        best = None
+        for i, tau1 in enumerate(taus):
+            for tau2 in taus[i + 1:]:
+                loadings = _nss_loadings(tenors, tau1, tau2)
+                beta, *_ = np.linalg.lstsq(loadings, zero, rcond=None)
+                sse = float(((loadings @ beta - zero) ** 2).sum())
+                if best is None or sse < best[0]:
+                    best = (sse, beta, tau1, tau2)
+
+        _, beta, tau1, tau2 = best
+        return {'beta': beta, 'tau1': tau1, 'tau2': tau2}
+
+    def zero(self, t):
+        """연속복리 zero 금리 (t: 년, 배열)"""
+        t = np.asarray(t, dtype=float)
+        if self.method == 'nss':
+            p = self.params
+            return (_nss_loadings(t.ravel(), p['tau1'], p['tau2']) @ p['beta']).reshape(t.shape)
+
+        clipped = np.clip(t, self.tenors[0], self.tenors[-1])
+        return self._spline(clipped)
+
+    def discount(self, t):
+        """할인계수 exp(-z(t) t)"""
+        t = np.asarray(t, dtype=float)
+        return np.exp(-self.zero(t) * t)
+
+    def forward(self, t1, t2):
+        """t1 ~ t2 구간 연속복리 선도금리 (배열 브로드캐스팅)"""
+        t1, t2 = np.broadcast_arrays(np.asarray(t1, dtype=float), np.asarray(t2, dtype=float))
+        if (t2 <= t1).any():
+            raise ValueError("forward 는 t2 > t1 이어야 합니다.")
+        return (self.zero(t2) * t2 - self.zero(t1) * t1) / (t2 - t1)
+
+    def discount_grid(self, step=1/12, max_years=30.0):
+        """
+        일정 간격 시간 격자와 할인계수 (같은 격자는 재계산하지 않음)
+
+        Returns:
+        --------
+        tuple of np.ndarray
+            (times, discount_factors), 읽기 전용
+        """
+        key = (float(step), float(max_years))
+        with self._grid_lock:
+            grid = self._grids.get(key)
+        if grid is None:
+            times = np.arange(1, int(round(max_years / step)) + 1) * step
+            dfs = self.discount(times)
+            times.setflags(write=False)
+            dfs.setflags(write=False)
+            grid = (times, dfs)
+            with self._grid_lock:
+                self._grids[key] = grid
+        return grid
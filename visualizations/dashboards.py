@@ -7,7 +7,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from data.data_fetcher import DataFetcher
+from data.quotes import get_quote_service, HOME_INDICES
 from simulations.individual_products import (
     StockSimulator, BondPricer, OptionPricer, 
     HedgeSimulator, InterestRateSwap
@@ -56,36 +56,16 @@ def render_home():
     # 주요 지수 현황
     st.markdown("### 📊 주요 지수 현황")
 
-    col1, col2, col3 = st.columns(3)
-
-    fetcher = DataFetcher()
-
-    try:
-        sp500 = fetcher.get_stock_data("^GSPC", period="5d")
-        if not sp500.empty:
-            latest = sp500['Close'].iloc[-1]
-            change = ((sp500['Close'].iloc[-1] / sp500['Close'].iloc[-2]) - 1) * 100
-            col1.metric("S&P 500", f"${latest:.2f}", f"{change:+.2f}%")
-    except:
-        col1.metric("S&P 500", "N/A")
-
-    try:
-        nasdaq = fetcher.get_stock_data("^IXIC", period="5d")
-        if not nasdaq.empty:
-            latest = nasdaq['Close'].iloc[-1]
-            change = ((nasdaq['Close'].iloc[-1] / nasdaq['Close'].iloc[-2]) - 1) * 100
-            col2.metric("NASDAQ", f"${latest:.2f}", f"{change:+.2f}%")
-    except:
-        col2.metric("NASDAQ", "N/A")
-
-    try:
-        kospi = fetcher.get_stock_data("^KS11", period="5d")
-        if not kospi.empty:
-            latest = kospi['Close'].iloc[-1]
-            change = ((kospi['Close'].iloc[-1] / kospi['Close'].iloc[-2]) - 1) * 100
-            col3.metric("KOSPI", f"{latest:.2f}", f"{change:+.2f}%")
-    except:
-        col3.metric("KOSPI", "N/A")
+    # 3개 지수를 한 번에 조회 (캐시 만료 시 백그라운드 갱신)
+    quotes = get_quote_service().get_quotes(list(HOME_INDICES))
+
+    for col, (ticker, name) in zip(st.columns(len(HOME_INDICES)), HOME_INDICES.items()):
+        quote = quotes.get(ticker)
+        if quote is None:
+            col.metric(name, "N/A")
+            continue
+        prefix = "" if ticker == "^KS11" else "$"
+        col.metric(name, f"{prefix}{quote['price']:.2f}", f"{quote['change_pct']:+.2f}%")
 
 
 def render_individual_simulation():
@@ -7,11 +7,16 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from data.data_fetcher import DataFetcher
+from data.data_fetcher import get_shared_fetcher
+from data.quotes import get_quote_service, HOME_INDICES
 from simulations.individual_products import (
-    StockSimulator, BondPricer, OptionPricer, 
+    StockSimulator, HestonSimulator, MertonJumpSimulator, BondPricer, OptionPricer, 
     HedgeSimulator, InterestRateSwap
 )
+from simulations.bond_portfolio import BondPortfolio
+from simulations.path_summary import summarize_paths
+from simulations.sim_cache import get_simulation_cache
+from simulations.yield_curve import YieldCurve, parse_tenor
 from simulations.portfolio import PortfolioSimulator, StressScenarios
 
 def render_home():
@@ -55,36 +60,16 @@ def render_home():
     # 주요 지수 현황
     st.markdown("### 📊 주요 지수 현황")
 
-    col1, col2, col3 = st.columns(3)
-
-    fetcher = DataFetcher()
-
-    try:
-        sp500 = fetcher.get_stock_data("^GSPC", period="5d")
-        if not sp500.empty:
-            latest = sp500['Close'].iloc[-1]
-            change = ((sp500['Close'].iloc[-1] / sp500['Close'].iloc[-2]) - 1) * 100
-            col1.metric("S&P 500", f"${latest:.2f}", f"{change:+.2f}%")
-    except:
-        col1.metric("S&P 500", "N/A")
-
-    try:
-        nasdaq = fetcher.get_stock_data("^IXIC", period="5d")
-        if not nasdaq.empty:
-            latest = nasdaq['Close'].iloc[-1]
-            change = ((nasdaq['Close'].iloc[-1] / nasdaq['Close'].iloc[-2]) - 1) * 100
-            col2.metric("NASDAQ", f"${latest:.2f}", f"{change:+.2f}%")
-    except:
-        col2.metric("NASDAQ", "N/A")
-
-    try:
-        kospi = fetcher.get_stock_data("^KS11", period="5d")
-        if not kospi.empty:
-            latest = kospi['Close'].iloc[-1]
-            change = ((kospi['Close'].iloc[-1] / kospi['Close'].iloc[-2]) - 1) * 100
-            col3.metric("KOSPI", f"{latest:.2f}", f"{change:+.2f}%")
-    except:
-        col3.metric("KOSPI", "N/A")
+    # 3개 지수를 한 번에 조회 (캐시 만료 시 백그라운드 갱신)
+    quotes = get_quote_service().get_quotes(list(HOME_INDICES))
+
+    for col, (ticker, name) in zip(st.columns(len(HOME_INDICES)), HOME_INDICES.items()):
+        quote = quotes.get(ticker)
+        if quote is None:
+            col.metric(name, "N/A")
+            continue
+        prefix = "" if ticker == "^KS11" else "$"
+        col.metric(name, f"{prefix}{quote['price']:.2f}", f"{quote['change_pct']:+.2f}%")
 
 
 def render_individual_simulation():
@@ -120,7 +105,7 @@ def render_stock_simulation():
         ticker = st.text_input("티커 입력", value="AAPL")
 
         if st.button("데이터 조회"):
-            fetcher = DataFetcher()
+            fetcher = get_shared_fetcher()
             data = fetcher.get_stock_data(ticker, period="1y")
 
             if not data.empty:
@@ -136,16 +121,65 @@ def render_stock_simulation():
             sigma = st.slider("변동성 (연율)", 0.1, 1.0, 0.3, 0.05)
             T = st.slider("시뮬레이션 기간 (년)", 0.1, 5.0, 1.0, 0.1)
             n_sims = st.slider("시뮬레이션 횟수", 100, 5000, 1000, 100)
+            sampling_labels = {
+                '일반 Monte Carlo': 'mc',
+                '대조 변량 (Antithetic)': 'antithetic',
+                '준난수 (Sobol)': 'sobol'
+            }
+            sampling = sampling_labels[st.selectbox("난수 생성 방식", list(sampling_labels))]
+
+            model = st.selectbox("가격 모형", ["GBM (고정 변동성)", "Heston (확률변동성)", "Merton (점프확산)"])
+            if model.startswith("Heston"):
+                kappa = st.slider("평균회귀 속도 (kappa)", 0.1, 10.0, 2.0, 0.1)
+                theta = st.slider("장기 변동성", 0.05, 1.0, float(sigma), 0.05)
+                xi = st.slider("변동성의 변동성 (xi)", 0.0, 2.0, 0.5, 0.05)
+                rho = st.slider("주가-변동성 상관계수", -1.0, 1.0, -0.7, 0.05)
+            elif model.startswith("Merton"):
+                lam = st.slider("연간 점프 횟수", 0.0, 10.0, 1.0, 0.1)
+                jump_mean = st.slider("평균 점프 크기 (로그)", -0.5, 0.5, -0.1, 0.01)
+                jump_std = st.slider("점프 크기 표준편차", 0.0, 0.5, 0.15, 0.01)
+
+            confidence = st.select_slider(
+                "신뢰수준", options=[0.90, 0.95, 0.99, 0.995], value=0.95,
+                format_func=lambda c: f"{c:.1%}"
+            )
 
             if st.button("시뮬레이션 실행"):
-                simulator = StockSimulator(S0, mu, sigma, T)
-                paths = simulator.simulate(n_sims)
-                var = simulator.calculate_var(paths)
-                cvar = simulator.calculate_cvar(paths)
-
-                st.session_state['sim_paths'] = paths
-                st.session_state['var'] = var
-                st.session_state['cvar'] = cvar
+                if model.startswith("Heston"):
+                    simulator = HestonSimulator(S0, mu, sigma**2, kappa, theta**2, xi, rho, T)
+                elif model.startswith("Merton"):
+                    simulator = MertonJumpSimulator(S0, mu, sigma, lam, jump_mean, jump_std, T)
+                else:
+                    simulator = StockSimulator(S0, mu, sigma, T)
+                st.session_state['sim_request'] = (simulator, n_sims, sampling)
+                st.session_state.pop('sim_summary_for', None)
+
+            if 'sim_request' in st.session_state:
+                # 같은 파라미터는 캐시된 경로를 재사용 (신뢰수준만 바꾸면 재시뮬레이션 없음,
+                # GBM 은 만기만 늘어나면 뒤쪽 구간만 추가 생성)
+                request = st.session_state['sim_request']
+                simulator, n_paths, method = request
+
+                # 경로는 요청마다 한 번만 읽어 분위수 밴드와 만기 주가만 남기고,
+                # 신뢰수준별 위험은 만기 주가로 계산 (관련 없는 위젯 변경 시 재계산 없음)
+                if st.session_state.get('sim_summary_for') is not request:
+                    paths = get_simulation_cache().get_paths(simulator, n_paths, sampling=method)
+                    st.session_state['sim_bands'] = summarize_paths(paths)
+                    st.session_state['sim_terminal'] = paths[:, -1].copy()
+                    st.session_state['sim_risk'] = {}
+                    st.session_state['sim_summary_for'] = request
+                risks = st.session_state['sim_risk']
+                if confidence not in risks:
+                    risks[confidence] = simulator.calculate_risk_with_error(
+                        st.session_state['sim_terminal'], confidence, sampling=method
+                    )
+                risk = risks[confidence]
+
+                st.session_state['confidence'] = confidence
+                st.session_state['var'] = risk['var']
+                st.session_state['cvar'] = risk['cvar']
+                st.session_state['var_se'] = risk['var_se']
+                st.session_state['cvar_se'] = risk['cvar_se']
 
         with col2:
             # 실제 주가 차트
@@ -165,30 +199,44 @@ def render_stock_simulation():
             st.plotly_chart(fig, width='stretch')  # ✅ warning 해결
 
             # 시뮬레이션 결과
-            if 'sim_paths' in st.session_state:
+            if 'sim_bands' in st.session_state:
                 st.markdown("### 시뮬레이션 결과")
 
+                bands = st.session_state['sim_bands']
                 fig2 = go.Figure()
 
-                for i in range(min(100, st.session_state['sim_paths'].shape[0])):
+                # 바깥 밴드(5~95%)부터 안쪽 밴드(25~75%) 순으로 채우기
+                for lower, upper, color, name in [
+                    ('p5', 'p95', 'rgba(173, 216, 230, 0.4)', '5~95% 구간'),
+                    ('p25', 'p75', 'rgba(100, 149, 237, 0.5)', '25~75% 구간')
+                ]:
                     fig2.add_trace(go.Scatter(
-                        y=st.session_state['sim_paths'][i],
-                        mode='lines',
-                        line=dict(width=0.5, color='lightblue'),
-                        showlegend=False,
-                        hoverinfo='skip'
+                        x=bands.index, y=bands[upper],
+                        mode='lines', line=dict(width=0),
+                        showlegend=False, hoverinfo='skip'
+                    ))
+                    fig2.add_trace(go.Scatter(
+                        x=bands.index, y=bands[lower],
+                        mode='lines', line=dict(width=0),
+                        fill='tonexty', fillcolor=color,
+                        name=name
                     ))
 
-                mean_path = np.mean(st.session_state['sim_paths'], axis=0)
                 fig2.add_trace(go.Scatter(
-                    y=mean_path,
+                    x=bands.index, y=bands['p50'],
+                    mode='lines',
+                    line=dict(width=2, color='royalblue'),
+                    name='중앙값'
+                ))
+                fig2.add_trace(go.Scatter(
+                    x=bands.index, y=bands['mean'],
                     mode='lines',
                     line=dict(width=3, color='red'),
                     name='평균'
                 ))
 
                 fig2.update_layout(
-                    title="Monte Carlo 시뮬레이션 경로",
+                    title="Monte Carlo 시뮬레이션 분위수 밴드",
                     xaxis_title="시간 (일)",
                     yaxis_title="주가",
                     hovermode='x unified'
@@ -197,5 +245,38 @@ def render_stock_simulation():
 
                 # VaR & CVaR 표시
                 col_a, col_b = st.columns(2)
-                col_a.metric("VaR (95%)", f"{st.session_state['var']*100:.2f}%")
-                col_b.metric("CVaR (95%)", f"{st.session_state['cvar']*100:.2f}%")
+                level = st.session_state.get('confidence', 0.95)
+                col_a.metric(f"VaR ({level:.1%})", f"{st.session_state['var']*100:.2f}%")
+                col_b.metric(f"CVaR ({level:.1%})", f"{st.session_state['cvar']*100:.2f}%")
+                var_se = st.session_state.get('var_se', np.nan)
+                cvar_se = st.session_state.get('cvar_se', np.nan)
+                if np.isfinite(var_se):
+                    col_a.caption(f"표준오차 ±{var_se*100:.2f}%p")
+                if np.isfinite(cvar_se):
+                    col_b.caption(f"표준오차 ±{cvar_se*100:.2f}%p")
+
+            # 공통 난수로 변동성 격자 전체를 한 번에 계산
+            st.markdown("### 변동성 민감도 분석")
+            if st.button("민감도 분석 실행"):
+                sweep = StockSimulator(S0, mu, sigma, T).parameter_sweep(
+                    sigmas=np.round(np.arange(0.1, 1.0001, 0.05), 2),
+                    n_simulations=20000,
+                    confidence_levels=(0.95, 0.99)
+                )
+
+                fig3 = go.Figure()
+                for c, group in sweep.groupby('confidence'):
+                    fig3.add_trace(go.Scatter(
+                        x=group['sigma'], y=group['var'] * 100,
+                        mode='lines+markers', name=f"VaR ({c:.0%})"
+                    ))
+                    fig3.add_trace(go.Scatter(
+                        x=group['sigma'], y=group['cvar'] * 100,
+                        mode='lines', line=dict(dash='dash'), name=f"CVaR ({c:.0%})"
+                    ))
+                fig3.update_layout(
+                    xaxis_title="변동성 (연율)",
+                    yaxis_title="손실 (%)",
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig3, width='stretch')
@@ -1,4 +1,15 @@
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def fitted_treasury_curve(yields, method='pchip'):
+    """
+    국채 par 수익률(% 단위 Series) 로 적합한 YieldCurve
+
+    같은 수익률/적합 방식이면 세션과 재실행에 관계없이 한 번만 적합하고 공유하므로
+    곡선의 할인계수 격자 캐시(discount_grid)도 함께 재사용됩니다.
+    """
+    return YieldCurve.from_treasury_yields(yields, method=method)
+
+
 def render_bond_yield_curve():
     """채권 & 수익률 곡선 시뮬레이션"""
     st.header("채권 가격 & 수익률 곡선 분석")
@@ -16,19 +27,40 @@ def render_bond_yield_curve():
             frequency = st.selectbox("이자 지급 횟수", [1, 2, 4], index=1)
 
         periods = years * frequency
-        price = BondPricer.price_bond(face_value, coupon_rate, ytm, periods, frequency)
-        duration = BondPricer.duration(face_value, coupon_rate, ytm, periods, frequency)
+        risk = BondPricer.bond_risk(face_value, coupon_rate, ytm, periods, frequency)
+        price = risk['price']
 
         with col2:
             st.markdown("### 계산 결과")
             st.metric("채권 가격", f"${price:.2f}")
-            st.metric("듀레이션", f"{duration:.2f}년")
             st.metric("할인/할증", f"${price - face_value:+.2f}")
+            col_a, col_b = st.columns(2)
+            col_a.metric("듀레이션", f"{risk['macaulay_duration']:.2f}년")
+            col_b.metric("수정 듀레이션", f"{risk['modified_duration']:.2f}")
+            col_a.metric("컨벡서티", f"{risk['convexity']:.2f}")
+            col_b.metric("DV01", f"${risk['dv01']:.4f}")
+
+        # 시장 가격 -> 만기수익률 역산
+        with st.expander("시장 가격으로 만기수익률 계산"):
+            market_price = st.number_input("시장 가격", value=float(round(price, 2)), min_value=0.01)
+            solved = BondPricer.yield_to_maturity(market_price, face_value, coupon_rate, periods, frequency)
+            if solved['converged']:
+                st.metric("만기수익률 (YTM)", f"{solved['ytm']*100:.4f}%")
+                st.caption(f"Newton 반복 {solved['iterations']}회")
+            else:
+                st.warning("해당 가격에 맞는 만기수익률을 찾지 못했습니다.")
+
+        # 국채 만기별 금리 민감도
+        st.markdown("### Key Rate Duration")
+        krd = BondPricer.key_rate_durations(face_value, coupon_rate, ytm, periods, frequency).iloc[0]
+        fig_krd = go.Figure(go.Bar(x=list(krd.index), y=krd.values, name='Key Rate Duration'))
+        fig_krd.update_layout(xaxis_title="만기", yaxis_title="듀레이션")
+        st.plotly_chart(fig_krd, width='stretch')
 
         # YTM에 따른 가격 변화
         st.markdown("### 만기수익률에 따른 가격 변화")
         ytm_range = np.linspace(max(0.001, ytm - 0.05), ytm + 0.05, 50)
-        prices = [BondPricer.price_bond(face_value, coupon_rate, y, periods, frequency) for y in ytm_range]
+        prices = BondPricer.price_bonds(face_value, coupon_rate, ytm_range, periods, frequency)
 
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=ytm_range*100, y=prices, mode='lines', name='채권 가격'))
@@ -44,9 +76,13 @@ def render_bond_yield_curve():
         st.markdown("### 🎓 수익률 곡선 변화 시뮬레이션")
         st.info("수익률 곡선의 Parallel Shift, Steepening, Flattening 효과를 시뮬레이션합니다.")
 
-        fetcher = DataFetcher()
+        fetcher = get_shared_fetcher()
         base_yields = fetcher.get_treasury_yields()
 
+        missing_tenors = list(base_yields.index[base_yields.isna()])
+        if missing_tenors:
+            st.warning(f"{', '.join(missing_tenors)} 수익률을 조회하지 못해 해당 만기를 제외합니다.")
+
         col1, col2 = st.columns([1, 2])
 
         with col1:
@@ -58,6 +94,9 @@ def render_bond_yield_curve():
             magnitude_bp = st.slider("변화 크기 (bp)", -200, 200, 100, 10)
             magnitude = magnitude_bp / 10000  # bp to decimal
 
+            fit_options = {'pchip': "단조 스플라인 (관측 만기 통과)", 'nss': "Nelson-Siegel-Svensson"}
+            fit_method = st.selectbox("곡선 적합 방식", list(fit_options), format_func=lambda x: fit_options[x])
+
             st.markdown(f"""
             **선택한 시나리오:**
             - {shift_type.upper()}
@@ -66,9 +105,10 @@ def render_bond_yield_curve():
 
         with col2:
             # 기본 수익률 곡선
+            # 곡선은 % 단위, 변화 크기는 소수 단위이므로 소수로 변환하여 계산
             shifted_yields = BondPricer.simulate_yield_curve_shift(
-                base_yields, shift_type, magnitude
-            )
+                base_yields / 100, shift_type, magnitude
+            ) * 100
 
             fig = go.Figure()
 
@@ -101,25 +141,28 @@ def render_bond_yield_curve():
             # 채권 가격 영향 분석
             st.markdown("### 채권 포트폴리오 영향")
 
-            maturities = [2, 5, 10, 30]
-            price_changes = []
-
-            for mat in maturities:
-                base_ytm = base_yields.get(f'{mat}Y', 4.0) / 100
-                shifted_ytm = shifted_yields.get(f'{mat}Y', 4.0) / 100
-
-                base_price = BondPricer.price_bond(1000, 0.05, base_ytm, mat*2, 2)
-                shifted_price = BondPricer.price_bond(1000, 0.05, shifted_ytm, mat*2, 2)
+            # 조회되지 않은 만기(NaN)는 제외하고 남은 만기로 보간
+            curves = pd.DataFrame([base_yields, shifted_yields]).dropna(axis=1)
+            if curves.shape[1] < 2:
+                st.warning("수익률 곡선 만기가 부족하여 채권 가격 영향을 계산할 수 없습니다.")
+            else:
+                maturities = [2, 5, 10, 30]
+                tenors = {label: parse_tenor(label) for label in curves.columns}
+                book = BondPortfolio(1000, 0.05, maturities, frequency=2, tenors=tenors)
 
-                price_change = ((shifted_price - base_price) / base_price) * 100
-                price_changes.append(price_change)
+                # 국채 par 수익률을 zero 곡선으로 부트스트래핑/적합한 뒤 현금흐름 행렬로 한 번에 재평가
+                base_curve, shifted_curve = (
+                    fitted_treasury_curve(curve.rename(None), fit_method) for _, curve in curves.iterrows()
+                )
+                pnl = book.scenario_pnl(base_curve, [shifted_curve])
+                price_changes = pnl[book.names].iloc[0].to_numpy() / book.price(base_curve) * 100
 
-            impact_df = pd.DataFrame({
-                '만기': [f'{m}년' for m in maturities],
-                '가격 변화 (%)': [f'{pc:+.2f}%' for pc in price_changes]
-            })
+                impact_df = pd.DataFrame({
+                    '만기': [f'{m}년' for m in maturities],
+                    '가격 변화 (%)': [f'{pc:+.2f}%' for pc in price_changes]
+                })
 
-            st.table(impact_df)
+                st.table(impact_df)
 
 
 def render_options_strategies():
@@ -333,18 +376,31 @@ def render_hedge_swap():
             st.markdown("### 변동금리 시나리오")
             scenario = st.radio(
                 "금리 추세",
-                ["상승", "하락", "변동"]
+                ["상승", "하락", "변동", "국채 곡선 내재 선도금리"]
+            )
+
+        # 국채 곡선 (조회된 만기만 사용, 수익률 곡선 탭과 같은 적합 곡선 공유)
+        treasury = get_shared_fetcher().get_treasury_yields().dropna()
+        curve_value = None
+        if len(treasury) >= 2:
+            curve_value = InterestRateSwap.price_on_curve(
+                notional, fixed_rate, periods, fitted_treasury_curve(treasury)
             )
 
         # 변동금리 시나리오 생성
         base_rate = fixed_rate
-        if scenario == "상승":
+        if scenario == "국채 곡선 내재 선도금리" and curve_value is None:
+            st.warning("수익률 곡선 만기가 부족하여 고정금리 유지 시나리오로 대체합니다.")
+            floating_rates = [base_rate] * periods
+        elif scenario == "국채 곡선 내재 선도금리":
+            floating_rates = list(curve_value['forward_rates'])
+        elif scenario == "상승":
             floating_rates = [base_rate + (i * 0.002) for i in range(periods)]
         elif scenario == "하락":
             floating_rates = [base_rate - (i * 0.002) for i in range(periods)]
         else:
-            np.random.seed(42)
-            floating_rates = [base_rate + np.random.uniform(-0.01, 0.01) for i in range(periods)]
+            rng = np.random.default_rng(42)
+            floating_rates = [base_rate + rng.uniform(-0.01, 0.01) for i in range(periods)]
 
         # IRS 현금흐름 계산
         cashflows = InterestRateSwap.calculate_cashflows(
@@ -366,6 +422,11 @@ def render_hedge_swap():
             else:
                 st.success(f"IRS를 통해 ${abs(total_net):,.0f} 절감!")
 
+            if curve_value is not None:
+                st.markdown("### 국채 곡선 기준 평가")
+                st.metric("시장 스왑 금리 (par)", f"{curve_value['par_rate']*100:.3f}%")
+                st.metric("순지급액 현재가치", f"${curve_value['pv']:+,.0f}")
+
         # 현금흐름 차트
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -13,22 +13,29 @@ def render_portfolio_simulation():
 
     period = st.selectbox("데이터 기간", ["6mo", "1y", "2y", "5y"], index=1)
 
+    missing_options = {
+        'ffill': "직전 가격으로 채움 (휴장일 수익률 0)",
+        'drop': "결측 구간 수익률 제거 (결측일과 다음 날 제외)"
+    }
+    missing = st.selectbox(
+        "결측 데이터 처리",
+        list(missing_options),
+        format_func=lambda x: missing_options[x]
+    )
+
     if st.button("데이터 조회 및 분석"):
         with st.spinner("데이터 조회 중..."):
-            fetcher = DataFetcher()
+            fetcher = get_shared_fetcher()
             data_dict = fetcher.get_multiple_stocks(tickers, period=period)
 
-            closes = pd.DataFrame()
-            for ticker, data in data_dict.items():
-                if not data.empty:
-                    closes[ticker] = data['Close']
+            closes = fetcher.build_price_panel(data_dict)
 
             if not closes.empty:
-                returns = closes.pct_change().dropna()
+                returns = fetcher.build_returns_panel(closes, missing=missing)
 
                 st.session_state['closes'] = closes
                 st.session_state['returns'] = returns
-                st.session_state['tickers'] = tickers
+                st.session_state['tickers'] = list(closes.columns)
                 st.success("데이터 조회 완료!")
 
     if 'returns' in st.session_state:
@@ -121,13 +128,21 @@ def render_correlation_risk(returns, tickers):
 
     col1, col2, col3 = st.columns(3)
 
-    var_hist = portfolio.calculate_var(confidence=0.95, method='historical')
+    risk_table = portfolio.calculate_risk_table()
     var_param = portfolio.calculate_var(confidence=0.95, method='parametric')
-    cvar = portfolio.calculate_cvar(confidence=0.95)
 
-    col1.metric("Historical VaR (95%)", f"{var_hist*100:.2f}%")
+    col1.metric("Historical VaR (95%)", f"{risk_table.loc[0.95, 'var']*100:.2f}%")
     col2.metric("Parametric VaR (95%)", f"{var_param*100:.2f}%")
-    col3.metric("CVaR (95%)", f"{cvar*100:.2f}%")
+    col3.metric("CVaR (95%)", f"{risk_table.loc[0.95, 'cvar']*100:.2f}%")
+
+    # 신뢰수준별 위험 표 (한 번의 계산)
+    panel = pd.DataFrame({
+        'VaR (%)': risk_table['var'] * 100,
+        'CVaR (%)': risk_table['cvar'] * 100,
+        '꼬리 관측 수': risk_table['tail_count']
+    })
+    panel.index = [f"{c:.1%}" for c in risk_table.index]
+    st.dataframe(panel.round(2), width='stretch')
 
 
 def render_efficient_frontier(returns, tickers):